@@ -1,16 +1,49 @@
-from flask import Flask, render_template, request, jsonify
 import os
+
+# Environment snapshot taken once at import; app.py reads its settings from it
+_ENV = dict(os.environ)
+
+if __name__ == '__main__' and _ENV.get('FLASK_ENV') != 'development':
+    # gevent must patch the standard library before sockets and threads are used
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, Response, current_app, g, render_template, request, jsonify
 import sys
+import json
+import time
 import atexit
+import signal
+import importlib
+import threading
+from datetime import datetime, timezone
 from config import get_config
 from utils.logging_config import get_logger
-from utils.alerting import send_error_alert, send_critical_alert, AlertSeverity
+from utils.json_provider import ORJSONProvider
 from utils.exceptions import ConfigurationError, DBIOperationsError
-from utils.file_cleanup import stop_file_cleanup_service
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Blueprint registry: module key -> (import path, blueprint attribute)
+# Modules are only imported when listed in ENABLED_MODULES.
+BLUEPRINT_REGISTRY = {
+    'assembly': ('modules.assembly', 'assembly_bp'),
+    'purchase_orders': ('modules.purchase_orders', 'po_bp'),
+}
+
+# Health check responses are cached briefly per app so frequent probes reuse one body;
+# when refreshing fails, the last good body is served for at most HEALTH_STALE_MAX_SECONDS
+HEALTH_CACHE_TTL_SECONDS = 5
+HEALTH_STALE_MAX_SECONDS = 60
+
+# Liveness probe path answered by LivenessProbeMiddleware without entering Flask
+LIVENESS_PROBE_PATH = '/health/live'
+LIVENESS_PROBE_BODY = b'{"status": "live"}'
+
+# Process-wide shutdown hooks are registered once, however many apps are created
+_shutdown_hooks_registered = False
+
 
 def create_app(config_name=None):
     """
@@ -28,22 +61,19 @@ def create_app(config_name=None):
         
         # Create Flask app
         app = Flask(__name__)
+        app.json = ORJSONProvider(app)
         app.config.from_object(config_class)
         
         # Initialize configuration (includes environment validation)
         config_class.init_app(app)
         
-        logger.info(f"🚀 Creating DBI Operations Hub app with {config_class.__name__}")
+        logger.info("🚀 Creating DBI Operations Hub app with %s", config_class.__name__)
         
-        # Register cleanup on app shutdown
-        atexit.register(stop_file_cleanup_service)
+        # Register cleanup on process shutdown
+        register_shutdown_hooks()
         
         # Register Blueprints
-        from modules.assembly import assembly_bp
-        from modules.purchase_orders import po_bp
-        
-        app.register_blueprint(assembly_bp)
-        app.register_blueprint(po_bp)
+        register_blueprints(app)
         
         # Register error handlers
         register_error_handlers(app)
@@ -51,168 +81,282 @@ def create_app(config_name=None):
         # Register main routes
         register_main_routes(app)
         
+        # Answer liveness probes ahead of Flask routing
+        app.wsgi_app = LivenessProbeMiddleware(app.wsgi_app)
+        
         logger.info("✅ DBI Operations Hub application created successfully")
         return app
         
     except ConfigurationError as e:
-        logger.critical(f"Configuration error during app creation: {e.message}")
+        logger.critical("Configuration error during app creation: %s", e.message)
+        from utils.alerting import send_critical_alert
         send_critical_alert(e, context={'phase': 'app_creation'})
         raise
     except Exception as e:
-        logger.critical(f"Unexpected error during app creation: {str(e)}")
+        logger.critical("Unexpected error during app creation: %s", e)
+        from utils.alerting import send_critical_alert
         send_critical_alert(e, context={'phase': 'app_creation'})
         raise
 
 
+class LivenessProbeMiddleware:
+    """
+    WSGI middleware that answers the liveness probe before Flask dispatching
+    
+    /health/live only reports that the process is serving requests; the
+    richer /health endpoint remains the readiness check.
+    """
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self.headers = [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(LIVENESS_PROBE_BODY)))
+        ]
+    
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == LIVENESS_PROBE_PATH:
+            start_response('200 OK', self.headers)
+            return [LIVENESS_PROBE_BODY]
+        return self.wsgi_app(environ, start_response)
+
+
+def register_shutdown_hooks():
+    """Stop the file cleanup service on interpreter exit or SIGTERM (registered once per process)"""
+    global _shutdown_hooks_registered
+    if _shutdown_hooks_registered:
+        return
+    
+    from utils.file_cleanup import stop_file_cleanup_service
+    atexit.register(stop_file_cleanup_service)
+    
+    # SIGTERM normally kills the process without running atexit handlers.
+    # Only take it over when nobody else (e.g. Gunicorn) has installed a handler.
+    if (threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL):
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    
+    _shutdown_hooks_registered = True
+
+
+def _exit_on_sigterm(signum, frame):
+    """Convert SIGTERM into a normal interpreter exit so atexit hooks run"""
+    logger.info("Received SIGTERM, shutting down")
+    sys.exit(128 + signum)
+
+
+def register_blueprints(app):
+    """Import and register blueprints for enabled modules only"""
+    for module_key in app.config.get('ENABLED_MODULES', ()):
+        registry_entry = BLUEPRINT_REGISTRY.get(module_key)
+        if registry_entry is None:
+            logger.warning("No blueprint registered for enabled module: %s", module_key)
+            continue
+        
+        module_path, blueprint_attr = registry_entry
+        module = importlib.import_module(module_path)
+        app.register_blueprint(getattr(module, blueprint_attr))
+        logger.debug("Registered blueprint for module: %s", module_key)
+
+
+def render_static_page(template_name):
+    """
+    Render a template that takes no context once per app and reuse the HTML
+    
+    Rendering is skipped on later calls; in debug mode templates are always
+    re-rendered so edits on disk show up immediately.
+    """
+    if current_app.debug:
+        return render_template(template_name)
+    
+    rendered_pages = current_app.extensions.setdefault('rendered_static_pages', {})
+    html = rendered_pages.get(template_name)
+    if html is None:
+        html = rendered_pages[template_name] = render_template(template_name)
+    return html
+
+
+def index():
+    """Main dashboard - choose between modules"""
+    try:
+        logger.info("Dashboard accessed", extra={'operation': 'dashboard_access'})
+        return render_static_page('index.html')
+    except Exception as e:
+        logger.error("Error rendering dashboard: %s", e)
+        from utils.alerting import send_error_alert
+        send_error_alert(e, context={'route': 'dashboard'})
+        return render_static_page('errors/500.html'), 500
+
+
+def health_check():
+    """Health check endpoint for Azure and monitoring"""
+    # (body, built at) for this app, replaced as one tuple so readers never see a mix
+    health_cache = current_app.extensions.setdefault('health_cache', {})
+    cached = health_cache.get('entry')
+    if cached is not None and time.monotonic() - cached[1] < HEALTH_CACHE_TTL_SECONDS:
+        return Response(cached[0], mimetype='application/json')
+    
+    try:
+        from utils.file_cleanup import cleanup_manager
+        
+        health_data = {
+            'status': 'healthy',
+            'modules': current_app.config.get('ENABLED_MODULES', ()),
+            'environment': _ENV.get('FLASK_ENV', 'development'),
+            'cleanup_service_running': cleanup_manager.running,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+        body = json.dumps(health_data)
+        
+        health_cache['entry'] = (body, time.monotonic())
+        
+        logger.debug("Health check accessed", extra={'operation': 'health_check'})
+        return Response(body, mimetype='application/json')
+        
+    except Exception as e:
+        logger.error("Health check failed: %s", e)
+        from utils.alerting import send_error_alert, AlertSeverity
+        send_error_alert(e, AlertSeverity.HIGH, context={'route': 'health_check'})
+        
+        # Keep serving the last known-good response while it is not too old
+        if cached is not None and time.monotonic() - cached[1] < HEALTH_STALE_MAX_SECONDS:
+            return Response(cached[0], mimetype='application/json')
+        
+        return jsonify({
+            'status': 'unhealthy',
+            'error': str(e),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }), 500
+
+
+def manual_cleanup():
+    """Manual cleanup endpoint for administrative use"""
+    try:
+        from utils.file_cleanup import run_manual_cleanup
+        
+        stats = run_manual_cleanup()
+        logger.info("Manual cleanup completed", extra={
+            'operation': 'manual_cleanup',
+            'files_deleted': stats['files_deleted'],
+            'bytes_freed': stats['bytes_freed']
+        })
+        
+        return jsonify({'status': 'success', **stats})
+        
+    except Exception as e:
+        logger.error("Manual cleanup failed: %s", e)
+        from utils.alerting import send_error_alert
+        send_error_alert(e, context={'route': 'manual_cleanup'})
+        return jsonify({
+            'status': 'error',
+            'message': f"Cleanup failed: {str(e)}"
+        }), 500
+
+
 def register_main_routes(app):
     """Register main application routes"""
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/health', 'health_check', health_check)
+    app.add_url_rule('/system/cleanup', 'manual_cleanup', manual_cleanup)
+
+
+# JSON bodies for the fixed error responses, serialized once at import
+NOT_FOUND_JSON_BODY = json.dumps({
+    'error': True,
+    'message': 'Resource not found',
+    'status_code': 404
+})
+INTERNAL_ERROR_JSON_BODY = json.dumps({
+    'error': True,
+    'message': 'Internal server error',
+    'status_code': 500
+})
+FILE_TOO_LARGE_JSON_BODY = json.dumps({
+    'error': True,
+    'message': 'File too large. Maximum size allowed is 50MB.',
+    'error_code': 'FILE_TOO_LARGE',
+    'status_code': 413
+})
+
+
+def is_json_request():
+    """Whether the current request has a JSON content type (parsed once per request)"""
+    is_json = g.get('is_json_request')
+    if is_json is None:
+        is_json = g.is_json_request = request.is_json
+    return is_json
+
+
+def handle_configuration_error(error):
+    """Handle configuration errors"""
+    logger.error("Configuration error: %s", error.message)
+    from utils.alerting import send_critical_alert
+    send_critical_alert(error)
+    
+    return render_static_page('errors/500.html'), 500
+
+
+def handle_dbi_operations_error(error):
+    """Handle custom DBI operations errors"""
+    logger.error("DBI Operations error: %s", error.message)
+    from utils.alerting import send_error_alert
+    send_error_alert(error, context={'error_code': error.error_code})
+    
+    if is_json_request():
+        return jsonify(error.to_dict()), 500
     
-    @app.route('/')
-    def index():
-        """Main dashboard - choose between modules"""
-        try:
-            logger.info("Dashboard accessed", extra={'operation': 'dashboard_access'})
-            return render_template('index.html')
-        except Exception as e:
-            logger.error(f"Error rendering dashboard: {str(e)}")
-            send_error_alert(e, context={'route': 'dashboard'})
-            return render_template('errors/500.html'), 500
-    
-    @app.route('/health')
-    def health_check():
-        """Health check endpoint for Azure and monitoring"""
-        try:
-            from utils.file_cleanup import cleanup_manager
-            
-            health_data = {
-                'status': 'healthy',
-                'modules': app.config.get('ENABLED_MODULES', []),
-                'environment': os.environ.get('FLASK_ENV', 'development'),
-                'cleanup_service_running': cleanup_manager.running,
-                'timestamp': import_datetime().datetime.now(import_datetime().timezone.utc).isoformat()
-            }
-            
-            logger.debug("Health check accessed", extra={'operation': 'health_check'})
-            return jsonify(health_data)
-            
-        except Exception as e:
-            logger.error(f"Health check failed: {str(e)}")
-            send_error_alert(e, AlertSeverity.HIGH, context={'route': 'health_check'})
-            return jsonify({
-                'status': 'unhealthy',
-                'error': str(e),
-                'timestamp': import_datetime().datetime.now(import_datetime().timezone.utc).isoformat()
-            }), 500
-    
-    @app.route('/system/cleanup')
-    def manual_cleanup():
-        """Manual cleanup endpoint for administrative use"""
-        try:
-            from utils.file_cleanup import run_manual_cleanup
-            
-            stats = run_manual_cleanup()
-            logger.info(f"Manual cleanup completed", extra={
-                'operation': 'manual_cleanup',
-                'files_deleted': stats['files_deleted'],
-                'bytes_freed': stats['bytes_freed']
-            })
-            
-            return jsonify({
-                'status': 'success',
-                'message': f"Cleanup completed: deleted {stats['files_deleted']} files, freed {stats['bytes_freed']} bytes",
-                'stats': stats
-            })
-            
-        except Exception as e:
-            logger.error(f"Manual cleanup failed: {str(e)}")
-            send_error_alert(e, context={'route': 'manual_cleanup'})
-            return jsonify({
-                'status': 'error',
-                'message': f"Cleanup failed: {str(e)}"
-            }), 500
+    return render_static_page('errors/500.html'), 500
+
+
+def not_found_error(error):
+    """Handle 404 errors"""
+    logger.warning("404 error: %s", request.url)
+    
+    if is_json_request():
+        return Response(NOT_FOUND_JSON_BODY, status=404, mimetype='application/json')
+        
+    return render_static_page('errors/404.html'), 404
+
+
+def internal_error(error):
+    """Handle 500 errors with alerting"""
+    logger.error("500 error: %s", error, exc_info=True)
+    
+    # Send alert for 500 errors
+    from utils.alerting import send_error_alert, AlertSeverity
+    send_error_alert(
+        Exception(f"Internal server error: {str(error)}"),
+        AlertSeverity.HIGH,
+        context={
+            'route': request.endpoint,
+            'method': request.method,
+            'url': request.url
+        }
+    )
+    
+    if is_json_request():
+        return Response(INTERNAL_ERROR_JSON_BODY, status=500, mimetype='application/json')
+        
+    return render_static_page('errors/500.html'), 500
+
+
+def file_too_large_error(error):
+    """Handle file upload size errors"""
+    logger.warning("File upload too large: %s", request.url)
+    
+    if is_json_request():
+        return Response(FILE_TOO_LARGE_JSON_BODY, status=413, mimetype='application/json')
+    
+    return render_static_page('errors/500.html'), 413
 
 
 def register_error_handlers(app):
     """Register error handlers with alerting"""
-    
-    @app.errorhandler(ConfigurationError)
-    def handle_configuration_error(error):
-        """Handle configuration errors"""
-        logger.error(f"Configuration error: {error.message}")
-        send_critical_alert(error)
-        
-        return render_template('errors/500.html'), 500
-    
-    @app.errorhandler(DBIOperationsError)
-    def handle_dbi_operations_error(error):
-        """Handle custom DBI operations errors"""
-        logger.error(f"DBI Operations error: {error.message}")
-        send_error_alert(error, context={'error_code': error.error_code})
-        
-        if request.is_json:
-            return jsonify(error.to_dict()), 500
-        
-        return render_template('errors/500.html'), 500
-    
-    @app.errorhandler(404)
-    def not_found_error(error):
-        """Handle 404 errors"""
-        logger.warning(f"404 error: {request.url}")
-        
-        if request.is_json:
-            return jsonify({
-                'error': True,
-                'message': 'Resource not found',
-                'status_code': 404
-            }), 404
-            
-        return render_template('errors/404.html'), 404
-
-    @app.errorhandler(500)
-    def internal_error(error):
-        """Handle 500 errors with alerting"""
-        logger.error(f"500 error: {str(error)}", exc_info=True)
-        
-        # Send alert for 500 errors
-        send_error_alert(
-            Exception(f"Internal server error: {str(error)}"),
-            AlertSeverity.HIGH,
-            context={
-                'route': request.endpoint,
-                'method': request.method,
-                'url': request.url
-            }
-        )
-        
-        if request.is_json:
-            return jsonify({
-                'error': True,
-                'message': 'Internal server error',
-                'status_code': 500
-            }), 500
-            
-        return render_template('errors/500.html'), 500
-    
-    @app.errorhandler(413)
-    def file_too_large_error(error):
-        """Handle file upload size errors"""
-        logger.warning(f"File upload too large: {request.url}")
-        
-        if request.is_json:
-            return jsonify({
-                'error': True,
-                'message': 'File too large. Maximum size allowed is 50MB.',
-                'error_code': 'FILE_TOO_LARGE',
-                'status_code': 413
-            }), 413
-        
-        return render_template('errors/500.html'), 413
-
-
-def import_datetime():
-    """Helper function to import datetime module"""
-    import datetime
-    return datetime
+    app.register_error_handler(ConfigurationError, handle_configuration_error)
+    app.register_error_handler(DBIOperationsError, handle_dbi_operations_error)
+    app.register_error_handler(404, not_found_error)
+    app.register_error_handler(500, internal_error)
+    app.register_error_handler(413, file_too_large_error)
 
 
 if __name__ == '__main__':
@@ -221,15 +365,22 @@ if __name__ == '__main__':
         app = create_app()
         
         # Use PORT environment variable for Azure, default to 5000 for local development
-        port = int(os.environ.get('PORT', 5000))
-        debug = os.environ.get('FLASK_ENV') == 'development'
+        port = int(_ENV.get('PORT', 5000))
+        debug = _ENV.get('FLASK_ENV') == 'development'
         
-        logger.info(f"🏢 Starting DBI Operations Hub on port {port}")
-        logger.info(f"📊 Modules enabled: {', '.join(app.config.get('ENABLED_MODULES', []))}")
-        logger.info(f"🔧 Debug mode: {debug}")
+        logger.info("🏢 Starting DBI Operations Hub on port %s", port)
+        logger.info("📊 Modules enabled: %s", ', '.join(app.config.get('ENABLED_MODULES', ())))
+        logger.info("🔧 Debug mode: %s", debug)
         
-        app.run(host='0.0.0.0', port=port, debug=debug)
+        if debug:
+            # Flask dev server keeps the reloader and interactive debugger
+            app.run(host='0.0.0.0', port=port, debug=debug)
+        else:
+            # Cooperative gevent server; the Gunicorn equivalent is
+            # gunicorn -k gevent -w $((2 * CPU)) 'app:create_app()'
+            from gevent.pywsgi import WSGIServer
+            WSGIServer(('0.0.0.0', port), app).serve_forever()
         
     except Exception as e:
-        logger.critical(f"Failed to start application: {str(e)}")
+        logger.critical("Failed to start application: %s", e)
         sys.exit(1)
@@ -1,4 +1,8 @@
 import os
+import sys
+import functools
+import tempfile
+from types import MappingProxyType
 from utils.environment import validate_environment, EnvironmentValidator
 from utils.logging_config import setup_logging, get_logger
 from utils.file_cleanup import start_file_cleanup_service
@@ -7,14 +11,22 @@ from utils.exceptions import ConfigurationError
 logger = get_logger(__name__)
 
 
+@functools.cache
+def _validated_environment():
+    """Validate environment variables once per process and return the validated values"""
+    try:
+        validated_vars = validate_environment()
+        logger.info("✅ Environment validation completed successfully")
+        return validated_vars
+    except ConfigurationError as e:
+        logger.critical("❌ Environment validation failed: %s", e.message)
+        raise
+
+
 class Config:
     """Configuration class for DBI Operations Hub"""
     
-    # Environment validation
-    _env_validated = False
-    _validated_vars = {}
-    
-    # Flask configuration - will be set after environment validation
+    # Flask configuration - set from the validated environment in init_app
     SECRET_KEY = None
     
     # Upload folder configuration
@@ -25,14 +37,15 @@ class Config:
     # Azure configuration
     AZURE_STORAGE_CONNECTION_STRING = os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
     
-    # Module configuration
-    ENABLED_MODULES = [
+    # Module configuration (immutable; the set is for O(1) membership checks)
+    ENABLED_MODULES = (
         'assembly',
         'purchase_orders',
         # 'analytics',
         # 'hr',
         # 'quality_control'
-    ]
+    )
+    ENABLED_MODULES_SET = frozenset(ENABLED_MODULES)
     
     # Business logic defaults
     TARGET_DAYS_INVENTORY = 30
@@ -45,50 +58,41 @@ class Config:
     
     @classmethod
     def validate_environment(cls):
-        """Validate environment variables before app initialization"""
-        if not cls._env_validated:
-            try:
-                cls._validated_vars = validate_environment()
-                cls.SECRET_KEY = cls._validated_vars.get('SECRET_KEY')
-                cls._env_validated = True
-                logger.info("✅ Environment validation completed successfully")
-            except ConfigurationError as e:
-                logger.critical(f"❌ Environment validation failed: {e.message}")
-                raise
+        """Validate environment variables before app initialization (cached per process)"""
+        return _validated_environment()
     
     @staticmethod
     def init_app(app):
         """Initialize application with validated configuration"""
         try:
             # Validate environment first
-            Config.validate_environment()
+            validated_vars = Config.validate_environment()
             
             # Ensure Flask gets the validated SECRET_KEY
-            if Config.SECRET_KEY:
-                app.config['SECRET_KEY'] = Config.SECRET_KEY
+            secret_key = validated_vars.get('SECRET_KEY')
+            if secret_key:
+                app.config['SECRET_KEY'] = secret_key
             
             # Setup structured logging
             app_logger = setup_logging()
             app_logger.info("🔧 Initializing DBI Operations Hub")
             
-            # Ensure directories exist
+            # Ensure base and module-specific directories exist
             directories_to_create = [
                 Config.UPLOAD_FOLDER,
                 Config.STAGING_FOLDER,
                 'logs'  # For logging and cleanup
             ]
+            for base_folder in (Config.UPLOAD_FOLDER, Config.STAGING_FOLDER):
+                for module in Config.ENABLED_MODULES:
+                    directories_to_create.append(os.path.join(base_folder, module))
             
+            # Only create directories that are missing (one scandir per parent)
+            existing_directories = _find_existing_directories(directories_to_create)
             for directory in directories_to_create:
-                os.makedirs(directory, exist_ok=True)
-                logger.debug(f"Created directory: {directory}")
-            
-            # Create module-specific upload folders
-            for module in Config.ENABLED_MODULES:
-                module_upload_path = os.path.join(Config.UPLOAD_FOLDER, module)
-                module_staging_path = os.path.join(Config.STAGING_FOLDER, module)
-                os.makedirs(module_upload_path, exist_ok=True)
-                os.makedirs(module_staging_path, exist_ok=True)
-                logger.debug(f"Created module directories for: {module}")
+                if directory not in existing_directories:
+                    os.makedirs(directory, exist_ok=True)
+                    logger.debug("Created directory: %s", directory)
             
             # Start file cleanup service
             if Config.FILE_CLEANUP_ENABLED:
@@ -98,10 +102,28 @@ class Config:
             logger.info("✅ Application initialization completed successfully")
             
         except Exception as e:
-            logger.critical(f"❌ Application initialization failed: {str(e)}")
+            logger.critical("❌ Application initialization failed: %s", e)
             raise ConfigurationError(f"Application initialization failed: {str(e)}")
 
 
+def _find_existing_directories(directories):
+    """Return the subset of directories that already exist, scanning each parent once"""
+    existing = set()
+    parents = {os.path.dirname(directory) for directory in directories}
+    
+    for parent in parents:
+        try:
+            with os.scandir(parent or '.') as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        existing.add(os.path.join(parent, entry.name))
+        except OSError:
+            # Parent does not exist yet, so none of its children do either
+            continue
+    
+    return existing
+
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
@@ -127,7 +149,6 @@ class TestingConfig(Config):
     WTF_CSRF_ENABLED = False
     
     # Use in-memory or temporary directories for testing
-    import tempfile
     UPLOAD_FOLDER = os.path.join(tempfile.gettempdir(), 'dbi_test_uploads')
     STAGING_FOLDER = os.path.join(tempfile.gettempdir(), 'dbi_test_staging')
     
@@ -135,18 +156,24 @@ class TestingConfig(Config):
     FILE_CLEANUP_ENABLED = False
 
 
-# Configuration mapping
-config_map = {
+# Configuration mapping (read-only view)
+config_map = MappingProxyType({
     'development': DevelopmentConfig,
     'production': ProductionConfig,
     'testing': TestingConfig,
     'default': DevelopmentConfig
-}
+})
 
 
+@functools.lru_cache(maxsize=None)
 def get_config(config_name=None):
-    """Get configuration class based on environment"""
+    """
+    Get configuration class based on environment
+    
+    Results are memoized per config_name; call get_config.cache_clear()
+    after changing FLASK_ENV at runtime (e.g. in tests).
+    """
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
     
-    return config_map.get(config_name, config_map['default'])
+    return config_map.get(sys.intern(config_name), config_map['default'])
@@ -3,6 +3,24 @@ import numpy as np
 from typing import Dict, List, Any
 import os
 from datetime import datetime
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+# Shared worksheet styles, built once and reused for every styled cell
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=12)
+HEADER_FILL = PatternFill(start_color="2F4F4F", end_color="2F4F4F", fill_type="solid")
+DATA_FONT = Font(size=11)
+LIGHT_FILL = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+THIN_BORDER = Border(
+    left=Side(style='thin'), 
+    right=Side(style='thin'), 
+    top=Side(style='thin'), 
+    bottom=Side(style='thin')
+)
+CENTER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+LEFT_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+
+# Sheets with more data rows than this only get header styling and column widths
+MAX_STYLED_DATA_ROWS = 2000
 
 
 class AssemblyProcessor:
@@ -11,11 +29,17 @@ class AssemblyProcessor:
     Processes inventory, sales, and BOM data to generate assembly and transfer recommendations
     """
     
+    # Only these CSV columns are used by the analysis; the rest are skipped at parse time
+    AVAILABILITY_COLUMNS = {'SKU', 'ProductName', 'Location', 'OnHand', 'Available'}
+    REPLENISHMENT_COLUMNS = {'SKU', 'Name', 'AVG sales/mo'}
+    
     def __init__(self, debug_mode=False):
         self.debug_mode = debug_mode  # Control debug logging for performance  
         self.availability_df = None
         self.kpi_df = None
         self.bom_df = None
+        self._product_names = None  # SKU -> KPI product name, built on first lookup
+        self._transfer_recommendations = None  # Result of analyze_transfer_needs for the loaded data
         self.TARGET_DAYS_INVENTORY = 30  # Goal: 30 days of inventory
     
     def load_data(self, availability_path: str, replenishment_path: str, bom_path: str):
@@ -24,15 +48,24 @@ class AssemblyProcessor:
             print("Loading data files...")
             
             # Load availability report
-            self.availability_df = pd.read_csv(availability_path)
+            self.availability_df = pd.read_csv(
+                availability_path, usecols=lambda column: column in self.AVAILABILITY_COLUMNS
+            )
             print(f"Loaded availability data: {len(self.availability_df)} records")
             
             # Load replenishment/sales data (better than KPI data)
-            self.kpi_df = pd.read_csv(replenishment_path)
+            self.kpi_df = pd.read_csv(
+                replenishment_path, usecols=lambda column: column in self.REPLENISHMENT_COLUMNS
+            )
             print(f"Loaded replenishment data: {len(self.kpi_df)} records")
             
             # Load BOM data from Excel (headers are in row 3)
-            self.bom_df = pd.read_excel(bom_path, header=2)  # 0-indexed, so row 3 = header=2
+            # python-calamine parses xlsx several times faster; openpyxl is the fallback
+            # when it is not installed (ImportError) or pandas predates it (ValueError)
+            try:
+                self.bom_df = pd.read_excel(bom_path, header=2, engine='calamine')  # 0-indexed, so row 3 = header=2
+            except (ImportError, ValueError):
+                self.bom_df = pd.read_excel(bom_path, header=2, engine='openpyxl')
             print(f"Loaded BOM data: {len(self.bom_df)} records")
             
             # Clean and prepare data
@@ -49,14 +82,24 @@ class AssemblyProcessor:
         self.availability_df['OnHand'] = pd.to_numeric(self.availability_df['OnHand'], errors='coerce').fillna(0)
         self.availability_df['Available'] = pd.to_numeric(self.availability_df['Available'], errors='coerce').fillna(0)
         
+        # Classify locations once so the analysis filters are plain boolean column lookups
+        location = self.availability_df['Location'].astype(str)
+        self.availability_df['_is_nc_main'] = (location.str.contains('NC', regex=False) &
+                                               location.str.contains('Main', regex=False))
+        self.availability_df['_is_armory'] = location == 'NC - Armory'
+        self.availability_df['_is_main_exact'] = location == 'NC - Main'
+        
         # Clean replenishment data - handle the quoted SKU format  
         if 'SKU' in self.kpi_df.columns:
             # Remove quotes and equals sign from SKU format (="1590" or "1348 becomes 1590, 1348)
-            self.kpi_df['SKU'] = (self.kpi_df['SKU'].astype(str)
-                                 .str.replace('=', '', regex=False)  # Remove equals
-                                 .str.strip('"')  # Remove quotes from start/end
-                                 .str.strip("'")  # Remove single quotes 
-                                 .str.replace('"', '', regex=False))  # Remove any remaining quotes
+            # in one pass over the strings rather than one pass per string operation
+            self.kpi_df['SKU'] = [
+                sku.replace('=', '')  # Remove equals
+                   .strip('"')  # Remove quotes from start/end
+                   .strip("'")  # Remove single quotes
+                   .replace('"', '')  # Remove any remaining quotes
+                for sku in self.kpi_df['SKU'].astype(str)
+            ]
         
         # Clean sales data
         if 'AVG sales/mo' in self.kpi_df.columns:
@@ -66,6 +109,10 @@ class AssemblyProcessor:
         self.bom_df['Quantity'] = pd.to_numeric(self.bom_df['Quantity'], errors='coerce').fillna(0)
         self.bom_df['Available'] = pd.to_numeric(self.bom_df['Available'], errors='coerce').fillna(0)
         
+        # Lookups derived from the previous dataset no longer apply
+        self._product_names = None
+        self._transfer_recommendations = None
+        
         print("Data cleaning completed")
     
     def analyze_assembly_capacity(self) -> Dict[str, Any]:
@@ -90,97 +137,103 @@ class AssemblyProcessor:
             print(f"Pre-filtered availability: {len(availability_filtered)} from {len(self.availability_df)} records")
             print(f"Pre-filtered sales data: {len(kpi_filtered)} from {len(self.kpi_df)} records")
         
-        # Step 2: For each BOM product, check inventory status and component availability
-        for product_sku in bom_products:
-            # Get current inventory in NC-Main locations (using pre-filtered data)
-            current_stock = availability_filtered[
-                (availability_filtered['SKU'] == product_sku) &
-                (availability_filtered['Location'].str.contains('NC', na=False)) &
-                (availability_filtered['Location'].str.contains('Main', na=False))
-            ]['Available'].sum()
-            
-            # Get product name from availability data
-            product_name_data = self.availability_df[self.availability_df['SKU'] == product_sku]
-            product_name = 'Unknown'
-            if not product_name_data.empty:
-                product_name = product_name_data['ProductName'].iloc[0] if 'ProductName' in product_name_data.columns else 'Unknown'
-            
-            # Get sales velocity data (using pre-filtered data)
-            sales_data = kpi_filtered[kpi_filtered['SKU'] == product_sku]
-            avg_monthly_sales = 0
-            daily_sales = 0
-            days_of_inventory = float('inf')
-            
-            if not sales_data.empty:
-                avg_monthly_sales = pd.to_numeric(sales_data['AVG sales/mo'].iloc[0], errors='coerce')
-                if not pd.isna(avg_monthly_sales) and avg_monthly_sales > 0:
-                    daily_sales = avg_monthly_sales / 30
-                    days_of_inventory = current_stock / daily_sales if daily_sales > 0 else float('inf')
-            
-            # Step 3: Check if this product needs assembly (low stock OR no sales data but zero inventory)
-            needs_assembly = False
-            if avg_monthly_sales > 0:
-                # Product with sales data - check if below target days
-                needs_assembly = days_of_inventory < self.TARGET_DAYS_INVENTORY
-            elif current_stock <= 5:
-                # Product without sales data but very low/zero stock - might still be valuable to assemble
-                needs_assembly = True
+        # Build per-SKU lookups once instead of filtering the frames for every product
+        nc_main_stock = availability_filtered[availability_filtered['_is_nc_main']].groupby('SKU')['Available'].sum().to_dict()
+        total_available = self.availability_df.groupby('SKU')['Available'].sum().to_dict()
+        no_stock = self.availability_df['Available'].iloc[:0].sum()  # Same zero (and dtype) as summing no rows
+        
+        # First row per SKU wins, matching the previous iloc[0] lookups
+        first_sales = kpi_filtered.drop_duplicates(subset='SKU', keep='first')
+        sales_map = dict(zip(first_sales['SKU'], pd.to_numeric(first_sales['AVG sales/mo'], errors='coerce')))
+        name_map = {}
+        if 'ProductName' in self.availability_df.columns:
+            first_names = self.availability_df.drop_duplicates(subset='SKU', keep='first')
+            name_map = dict(zip(first_names['SKU'], first_names['ProductName']))
+        
+        # Aggregate component requirements per product in one pass over the BOM,
+        # skipping non-positive quantities and SV (service/non-inventory) components.
+        # Components keep their BOM order; multiple entries for one component are summed.
+        usable_bom = self.bom_df[
+            self.bom_df['Product SKU'].notna() &
+            (self.bom_df['Quantity'] > 0) &
+            ~self.bom_df['Component SKU'].astype(str).str.startswith('SV')
+        ]
+        component_totals = usable_bom.groupby(
+            ['Product SKU', 'Component SKU'], sort=False, dropna=False
+        )['Quantity'].sum()
+        bom_lists = {}
+        for (bom_sku, component_sku), required_qty in zip(component_totals.index, component_totals.values):
+            component_skus, required_qtys = bom_lists.setdefault(bom_sku, ([], []))
+            component_skus.append(component_sku)
+            required_qtys.append(required_qty)
+        
+        # Product SKU -> (component SKUs, required quantities) as aligned arrays
+        bom_map = {
+            bom_sku: (np.array(component_skus, dtype=object),
+                      np.array(required_qtys, dtype=component_totals.dtype))
+            for bom_sku, (component_skus, required_qtys) in bom_lists.items()
+        }
+        available_dtype = self.availability_df['Available'].dtype
+        
+        # Step 2: Decide which products need assembly for all BOM products at once
+        stock_arr = np.fromiter((nc_main_stock.get(sku, no_stock) for sku in bom_products),
+                                dtype=np.float64, count=len(bom_products))
+        sales_arr = np.fromiter((sales_map.get(sku, 0) for sku in bom_products),
+                                dtype=np.float64, count=len(bom_products))
+        has_sales = sales_arr > 0  # NaN and negative sales count as no sales data
+        daily_arr = np.where(has_sales, sales_arr / 30, 0.0)
+        days_arr = np.divide(stock_arr, daily_arr, out=np.full(len(bom_products), np.inf), where=has_sales)
+        
+        # Step 3: Products need assembly when below target days, or with no sales data
+        # but very low/zero stock (these might still be valuable to assemble)
+        needs_assembly = np.where(has_sales, days_arr < self.TARGET_DAYS_INVENTORY, stock_arr <= 5)
+        
+        # Step 4: For each product needing assembly, check component availability
+        debug_mode = self.debug_mode
+        for idx in np.flatnonzero(needs_assembly):
+            product_sku = bom_products[idx]
+            current_stock = stock_arr[idx]
+            days_of_inventory = days_arr[idx]
+            
+            if has_sales[idx]:
+                avg_monthly_sales = sales_arr[idx]
+            else:
                 avg_monthly_sales = 1  # Assume minimal sales for calculation
-                daily_sales = avg_monthly_sales / 30
+            daily_sales = avg_monthly_sales / 30
             
-            if not needs_assembly:
-                continue
+            # Get product name from availability data
+            product_name = name_map.get(product_sku, 'Unknown')
             
-            if self.debug_mode:
+            if debug_mode:
                 print(f"Analyzing {product_sku}: {current_stock} stock, {days_of_inventory:.1f} days inventory")
             
-            # Step 4: Get BOM and aggregate component requirements
-            product_bom = self.bom_df[self.bom_df['Product SKU'] == product_sku]
-            component_requirements = {}
-            
-            for _, bom_entry in product_bom.iterrows():
-                component_sku = bom_entry['Component SKU']
-                required_qty = pd.to_numeric(bom_entry['Quantity'], errors='coerce')
-                
-                if pd.isna(required_qty) or required_qty <= 0:
-                    continue
-                
-                # Skip SV components (service/non-inventory items)
-                if str(component_sku).startswith('SV'):
-                    continue
-                
-                # Aggregate requirements (sum up multiple BOM entries for same component)
-                if component_sku in component_requirements:
-                    component_requirements[component_sku] += required_qty
-                else:
-                    component_requirements[component_sku] = required_qty
-            
-            if not component_requirements:
+            # Get aggregated component requirements
+            if product_sku not in bom_map:
                 continue
+            component_skus, required_qtys = bom_map[product_sku]
             
-            # Step 5: Check component availability
-            can_assemble = True
-            min_assemblies = float('inf')
-            missing_components = []
+            # Step 5: Check component availability (total across all locations)
+            component_availability = np.fromiter(
+                (total_available.get(component_sku, no_stock) for component_sku in component_skus),
+                dtype=available_dtype, count=len(component_skus)
+            )
+            is_short = component_availability < required_qtys
+            can_assemble = not is_short.any()
+            
+            missing_components = [
+                {
+                    'sku': component_skus[i],
+                    'required': required_qtys[i],
+                    'available': component_availability[i],
+                    'shortage': required_qtys[i] - component_availability[i]
+                }
+                for i in np.flatnonzero(is_short)
+            ]
             
-            for component_sku, required_qty in component_requirements.items():
-                # Get total available quantity for this component across all locations
-                component_availability = self.availability_df[
-                    self.availability_df['SKU'] == component_sku
-                ]['Available'].sum()
-                
-                if component_availability < required_qty:
-                    can_assemble = False
-                    missing_components.append({
-                        'sku': component_sku,
-                        'required': required_qty,
-                        'available': component_availability,
-                        'shortage': required_qty - component_availability
-                    })
-                else:
-                    # Calculate how many complete assemblies we can make
-                    possible_assemblies = int(component_availability // required_qty)
-                    min_assemblies = min(min_assemblies, possible_assemblies)
+            # Calculate how many complete assemblies we can make
+            min_assemblies = float('inf')
+            if can_assemble:
+                min_assemblies = int((component_availability // required_qtys).min())
             
             # Step 6: Generate recommendations
             if can_assemble and min_assemblies > 0 and min_assemblies != float('inf'):
@@ -201,7 +254,7 @@ class AssemblyProcessor:
                         'avg_monthly_sales': round(avg_monthly_sales, 2),
                         'days_of_inventory': round(days_of_inventory, 1) if days_of_inventory != float('inf') else 0,
                         'max_possible_assemblies': min_assemblies,
-                        'components_needed': len(component_requirements)
+                        'components_needed': len(component_skus)
                     })
             else:
                 # Product cannot be assembled due to missing components
@@ -210,11 +263,11 @@ class AssemblyProcessor:
                     'product_name': product_name,
                     'missing_components': [comp['sku'] for comp in missing_components],
                     'component_details': missing_components,
-                    'total_components_required': len(component_requirements),
+                    'total_components_required': len(component_skus),
                     'missing_components_count': len(missing_components)
                 })
         
-        print(f"Assembly analysis complete:")
+        print("Assembly analysis complete:")
         print(f"  - {len(assembly_ready)} products ready for assembly")
         print(f"  - {len(cannot_assemble)} products cannot be assembled")
         
@@ -239,31 +292,23 @@ class AssemblyProcessor:
         
         assembly_ready.sort(key=assembly_priority, reverse=True)
         
-        # Add avg_monthly_sales to cannot_assemble items
+        # Add avg_monthly_sales to cannot_assemble items (sales_map values are already numeric)
         for item in cannot_assemble:
-            product_sku = item['product_sku']
-            # Get sales data for this SKU
-            sales_data = self.kpi_df[self.kpi_df['SKU'] == product_sku]
-            if not sales_data.empty:
-                avg_sales = sales_data['AVG sales/mo'].iloc[0]
-                # Convert from string if needed and handle NaN
-                try:
-                    item['avg_monthly_sales'] = float(avg_sales) if pd.notna(avg_sales) else 0
-                except (ValueError, TypeError):
-                    item['avg_monthly_sales'] = 0
-            else:
-                item['avg_monthly_sales'] = 0
+            avg_sales = sales_map.get(item['product_sku'], 0)
+            item['avg_monthly_sales'] = float(avg_sales) if pd.notna(avg_sales) else 0
+        
+        transfer_recommendations = self.analyze_transfer_needs()
         
         # Return as dictionary for easier access
         return {
             'assembly_ready': assembly_ready,
             'cannot_assemble': cannot_assemble,
-            'transfer_recommendations': self.analyze_transfer_needs(),
+            'transfer_recommendations': transfer_recommendations,
             'summary': {
                 'total_products_analyzed': len(bom_products),
                 'assembly_ready': len(assembly_ready),
                 'cannot_assemble': len(cannot_assemble),
-                'transfer_recommendations': len(self.analyze_transfer_needs())
+                'transfer_recommendations': len(transfer_recommendations)
             }
         }
     
@@ -271,67 +316,71 @@ class AssemblyProcessor:
         """
         Identify items in NC-Armory that should be transferred to NC-Main
         Based on sales velocity and current NC-Main inventory
+        The result is computed once per loaded dataset and reused on later calls.
         """
+        if self._transfer_recommendations is not None:
+            return self._transfer_recommendations
+        
         transfer_recommendations = []
         
-        # Get items in NC-Armory
+        # Get items with stock in NC-Armory
         armory_items = self.availability_df[
-            self.availability_df['Location'] == 'NC - Armory'
-        ].copy()
+            self.availability_df['_is_armory'] & (self.availability_df['Available'] > 0)
+        ]
         
-        for _, item in armory_items.iterrows():
-            sku = item['SKU']
-            armory_qty = item['Available']
-            product_name = item.get('ProductName', 'Unknown')
-            
-            if armory_qty <= 0:
-                continue
-            
-            # Get quantity in NC-Main
-            main_qty = self.availability_df[
-                (self.availability_df['SKU'] == sku) & 
-                (self.availability_df['Location'] == 'NC - Main')
-            ]['Available'].sum()
-            
-            # Get sales velocity
-            sales_data = self.kpi_df[self.kpi_df['SKU'] == sku]
-            avg_monthly_sales = sales_data['AVG sales/mo'].iloc[0] if not sales_data.empty else 0
-            
-            if avg_monthly_sales > 0:
-                daily_sales = avg_monthly_sales / 30
-                days_supply_in_main = main_qty / daily_sales if daily_sales > 0 else float('inf')
-                
-                # If NC-Main has less than 30 days supply, recommend transfer
-                if days_supply_in_main < self.TARGET_DAYS_INVENTORY:
-                    needed_qty = (self.TARGET_DAYS_INVENTORY * daily_sales) - main_qty
-                    suggested_transfer = min(int(needed_qty), int(armory_qty))
-                    
-                    if suggested_transfer > 0:
-                        transfer_recommendations.append({
-                            'sku': sku,
-                            'product_name': product_name,
-                            'qty_in_armory': int(armory_qty),
-                            'qty_in_main': int(main_qty),
-                            'avg_monthly_sales': round(avg_monthly_sales, 2),
-                            'days_supply_in_main': round(days_supply_in_main, 1),
-                            'suggested_transfer': suggested_transfer
-                        })
+        # Line each armory item up with its NC-Main quantity and first sales row
+        main_qty_by_sku = (self.availability_df[self.availability_df['_is_main_exact']]
+                           .groupby('SKU', sort=False)['Available'].sum())
+        sales_by_sku = (self.kpi_df.drop_duplicates(subset='SKU', keep='first')
+                        .set_index('SKU')['AVG sales/mo'])
+        
+        skus = armory_items['SKU'].to_numpy()
+        if 'ProductName' in armory_items.columns:
+            product_names = armory_items['ProductName'].to_numpy()
+        else:
+            product_names = np.full(len(armory_items), 'Unknown', dtype=object)
+        armory_qty = armory_items['Available'].to_numpy(dtype=np.float64)
+        main_qty = armory_items['SKU'].map(main_qty_by_sku).fillna(0).to_numpy(dtype=np.float64)
+        avg_sales = armory_items['SKU'].map(sales_by_sku).fillna(0).to_numpy(dtype=np.float64)
+        
+        # Items with sales: transfer when NC-Main has less than the target days of supply
+        has_sales = avg_sales > 0
+        daily_sales = np.where(has_sales, avg_sales / 30, 0.0)
+        days_supply_in_main = np.divide(main_qty, daily_sales,
+                                        out=np.full(len(armory_items), np.inf), where=has_sales)
+        needed_qty = (self.TARGET_DAYS_INVENTORY * daily_sales) - main_qty
+        suggested_transfer = np.minimum(np.trunc(needed_qty), np.trunc(armory_qty))
+        transfer_with_sales = has_sales & (days_supply_in_main < self.TARGET_DAYS_INVENTORY) & (suggested_transfer > 0)
+        
+        # Items with no sales data: consider transfer if Main has 0
+        transfer_without_sales = ~has_sales & (main_qty == 0)
+        
+        for idx in np.flatnonzero(transfer_with_sales | transfer_without_sales):
+            if has_sales[idx]:
+                transfer_recommendations.append({
+                    'sku': skus[idx],
+                    'product_name': product_names[idx],
+                    'qty_in_armory': int(armory_qty[idx]),
+                    'qty_in_main': int(main_qty[idx]),
+                    'avg_monthly_sales': round(avg_sales[idx], 2),
+                    'days_supply_in_main': round(days_supply_in_main[idx], 1),
+                    'suggested_transfer': int(suggested_transfer[idx])
+                })
             else:
-                # For items with no sales data, consider transfer if Main has 0
-                if main_qty == 0 and armory_qty > 0:
-                    transfer_recommendations.append({
-                        'sku': sku,
-                        'product_name': product_name,
-                        'qty_in_armory': int(armory_qty),
-                        'qty_in_main': int(main_qty),
-                        'avg_monthly_sales': 0,
-                        'days_supply_in_main': 0,
-                        'suggested_transfer': min(10, int(armory_qty))  # Conservative transfer
-                    })
+                transfer_recommendations.append({
+                    'sku': skus[idx],
+                    'product_name': product_names[idx],
+                    'qty_in_armory': int(armory_qty[idx]),
+                    'qty_in_main': int(main_qty[idx]),
+                    'avg_monthly_sales': 0,
+                    'days_supply_in_main': 0,
+                    'suggested_transfer': min(10, int(armory_qty[idx]))  # Conservative transfer
+                })
         
         # Sort by priority (lowest days supply first, then highest sales)
         transfer_recommendations.sort(key=lambda x: (x['days_supply_in_main'], -x['avg_monthly_sales']))
         
+        self._transfer_recommendations = transfer_recommendations
         return transfer_recommendations
     
     def export_to_excel(self, results: Dict[str, Any], output_path: str = "DBI_Assembly_Reports.xlsx"):
@@ -339,8 +388,6 @@ class AssemblyProcessor:
         Export results to Excel file with separate sheets for each report
         Enhanced with sorting by average monthly sales and professional styling
         """
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             
             # Sheet 1: Assembly Ready Products
@@ -375,24 +422,25 @@ class AssemblyProcessor:
             # Sheet 2: Cannot Assemble
             cannot_df = pd.DataFrame(results['cannot_assemble'])
             if not cannot_df.empty:
-                # Ensure avg_monthly_sales exists for sorting
-                for i, row in cannot_df.iterrows():
-                    if 'avg_monthly_sales' not in row or pd.isna(row.get('avg_monthly_sales', 0)):
-                        product_sku = row['product_sku']
-                        sales_data = self.kpi_df[self.kpi_df['SKU'] == product_sku]
-                        avg_sales = 0
-                        if not sales_data.empty:
-                            avg_sales = pd.to_numeric(sales_data['AVG sales/mo'].iloc[0], errors='coerce')
-                            if pd.isna(avg_sales):
-                                avg_sales = 0
-                        cannot_df.at[i, 'avg_monthly_sales'] = avg_sales
+                # Ensure avg_monthly_sales exists for sorting, filling gaps from the
+                # first KPI row per SKU in one vectorized lookup
+                if 'avg_monthly_sales' not in cannot_df.columns:
+                    cannot_df['avg_monthly_sales'] = np.nan
+                missing_sales = cannot_df['avg_monthly_sales'].isna()
+                if missing_sales.any():
+                    first_sales = (self.kpi_df.drop_duplicates(subset='SKU', keep='first')
+                                   .set_index('SKU')['AVG sales/mo'])
+                    cannot_df.loc[missing_sales, 'avg_monthly_sales'] = pd.to_numeric(
+                        cannot_df.loc[missing_sales, 'product_sku'].map(first_sales), errors='coerce'
+                    ).fillna(0)
                 
                 # Sort by average monthly sales (highest first)
                 cannot_df = cannot_df.sort_values('avg_monthly_sales', ascending=False)
                 
                 # Expand missing components for better readability
+                # (plain dict records are much cheaper to walk than iterrows Series)
                 expanded_cannot = []
-                for _, row in cannot_df.iterrows():
+                for row in cannot_df.to_dict('records'):
                     missing_components = row['missing_components'] if isinstance(row['missing_components'], list) else [row['missing_components']]
                     
                     # Get component shortage details if available
@@ -457,12 +505,7 @@ class AssemblyProcessor:
             summary_df = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
             summary_df.to_excel(writer, sheet_name='Summary', index=False)
             
-            # Format summary sheet
-            worksheet = writer.sheets['Summary']
-            worksheet.column_dimensions['A'].width = 25
-            worksheet.column_dimensions['B'].width = 20
-            
-            # Apply styling to summary sheet
+            # Apply styling to summary sheet (sets its fixed column widths)
             worksheet = writer.sheets['Summary']
             self._style_worksheet(worksheet, summary_df, is_summary=True)
             
@@ -482,11 +525,16 @@ class AssemblyProcessor:
     def _get_product_name(self, product_sku: str) -> str:
         """Get product name from KPI data for a given SKU"""
         try:
-            product_data = self.kpi_df[self.kpi_df['SKU'] == product_sku]
-            if not product_data.empty and 'Name' in product_data.columns:
-                name = product_data['Name'].iloc[0]
-                return name if pd.notna(name) else ""
-            return ""
+            if self._product_names is None:
+                # First KPI row per SKU, built once per loaded dataset
+                product_names = {}
+                if 'Name' in self.kpi_df.columns:
+                    first_rows = self.kpi_df.drop_duplicates(subset='SKU', keep='first')
+                    product_names = dict(zip(first_rows['SKU'], first_rows['Name']))
+                self._product_names = product_names
+            
+            name = self._product_names.get(product_sku)
+            return name if name is not None and pd.notna(name) else ""
         except Exception:
             return ""
     
@@ -494,68 +542,59 @@ class AssemblyProcessor:
         """
         Apply professional styling to Excel worksheet
         """
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        header_fill = PatternFill(start_color="2F4F4F", end_color="2F4F4F", fill_type="solid")
-        data_font = Font(size=11)
-        border = Border(
-            left=Side(style='thin'), 
-            right=Side(style='thin'), 
-            top=Side(style='thin'), 
-            bottom=Side(style='thin')
-        )
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        left_alignment = Alignment(horizontal="left", vertical="center")
-        
         # Set column widths based on sheet type
         if is_summary:
             worksheet.column_dimensions['A'].width = 30
             worksheet.column_dimensions['B'].width = 25
         else:
-            # Auto-size columns based on content
+            # Auto-size columns based on content (longest rendered value per column)
+            data_lengths = dataframe.astype(str).apply(lambda col: col.str.len().max()).fillna(0).to_numpy()
             for col_num, column in enumerate(dataframe.columns, 1):
                 col_letter = worksheet.cell(row=1, column=col_num).column_letter
                 max_length = max(
                     len(str(column)),  # Header length
-                    max([len(str(cell)) for cell in dataframe.iloc[:, col_num-1]], default=0)  # Data length
+                    int(data_lengths[col_num-1])  # Data length
                 )
                 worksheet.column_dimensions[col_letter].width = min(max_length + 2, 60)  # Cap at 60 chars
         
+        num_columns = len(dataframe.columns)
+        
         # Style header row
-        for col_num in range(1, len(dataframe.columns) + 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_alignment
-            cell.border = border
+        for cell in next(worksheet.iter_rows(min_row=1, max_row=1, max_col=num_columns), ()):
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = CENTER_ALIGNMENT
+            cell.border = THIN_BORDER
         
-        # Style data rows with alternating colors and spacing
-        light_fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+        # Increase row height for better readability via the sheet default,
+        # rather than a dimension entry per row
+        worksheet.sheet_format.defaultRowHeight = 20  # Default is 15
+        worksheet.sheet_format.customHeight = True
+        
+        # Per-cell styling of very large sheets costs more than it adds
+        if len(dataframe) > MAX_STYLED_DATA_ROWS:
+            return
         
-        for row_num in range(2, worksheet.max_row + 1):
+        # Style data rows with alternating colors and spacing
+        for row_num, row in enumerate(
+            worksheet.iter_rows(min_row=2, max_row=worksheet.max_row, max_col=num_columns), start=2
+        ):
             # Alternating row colors
             is_even_row = (row_num % 2 == 0)
             
-            for col_num in range(1, len(dataframe.columns) + 1):
-                cell = worksheet.cell(row=row_num, column=col_num)
-                cell.font = data_font
-                cell.border = border
+            for col_num, cell in enumerate(row, start=1):
+                cell.font = DATA_FONT
+                cell.border = THIN_BORDER
                 
                 # Apply alternating background
                 if is_even_row:
-                    cell.fill = light_fill
+                    cell.fill = LIGHT_FILL
                 
                 # Alignment based on data type
                 if col_num == 1:  # SKU columns - left align
-                    cell.alignment = left_alignment
+                    cell.alignment = LEFT_ALIGNMENT
                 else:  # Numbers - center align
-                    cell.alignment = center_alignment
-        
-        # Increase row height for better readability
-        for row_num in range(1, worksheet.max_row + 1):
-            worksheet.row_dimensions[row_num].height = 20  # Default is 15
+                    cell.alignment = CENTER_ALIGNMENT
 
     def generate_reports(self, availability_path: str, replenishment_path: str, bom_path: str, export_excel: bool = True) -> Dict[str, Any]:
         """
@@ -569,7 +608,7 @@ class AssemblyProcessor:
             # Generate assembly analysis (returns complete results with summary)
             results = self.analyze_assembly_capacity()
             
-            print(f"Report generation completed:")
+            print("Report generation completed:")
             print(f"  - {len(results['assembly_ready'])} products ready for assembly")
             print(f"  - {len(results['cannot_assemble'])} products cannot be assembled")
             print(f"  - {len(results['transfer_recommendations'])} transfer recommendations")
@@ -1,9 +1,9 @@
-from flask import render_template, request, jsonify, send_file, url_for
+from flask import render_template, request, jsonify, send_from_directory, url_for
+from werkzeug.exceptions import NotFound
 import os
-from pathlib import Path
 from . import assembly_bp
-from .processing import AssemblyProcessor
-from utils.file_validation import FileValidator, create_secure_filename
+from utils.file_validation import FileValidator, create_secure_filename, save_uploaded_file
+from utils.file_cleanup import remove_file
 from utils.exceptions import FileOperationError, ValidationError, DataProcessingError
 from utils.logging_config import get_logger, LoggerMixin
 from utils.alerting import send_error_alert, AlertSeverity
@@ -11,6 +11,14 @@ from utils.alerting import send_error_alert, AlertSeverity
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Module-specific directory for uploads being processed
+UPLOAD_DIR = os.path.join('uploads', 'assembly')
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Generated reports are written to the working directory and only served from there.
+# Absolute, because Flask resolves relative directories against the app root path.
+DOWNLOAD_ROOT = os.path.abspath(os.curdir)
+
 
 @assembly_bp.route('/')
 def assembly_index():
@@ -71,16 +79,12 @@ def process_assembly_files():
                 logger.warning(f"File validation failed for {file_key}: {str(validation_error)}")
                 raise ValidationError(f"File validation failed for {file_key}: {str(validation_error)}")
         
-        # Create module-specific upload directory  
-        upload_dir = os.path.join('uploads', 'assembly')
-        os.makedirs(upload_dir, exist_ok=True)
-        
         # Save validated files with secure names
         file_paths = {}
         
         for file_key, file_data in validated_files.items():
-            file_path = os.path.join(upload_dir, file_data['secure_name'])
-            file_data['file_storage'].save(file_path)
+            file_path = os.path.join(UPLOAD_DIR, file_data['secure_name'])
+            save_uploaded_file(file_data['file_storage'], file_path)
             file_paths[file_key] = file_path
             temp_files.append(file_path)
             
@@ -92,6 +96,7 @@ def process_assembly_files():
         
         # Process data and generate Excel file
         try:
+            from .processing import AssemblyProcessor  # Deferred: pulls in pandas/openpyxl
             processor = AssemblyProcessor()
             results = processor.generate_reports(
                 file_paths['availability'],
@@ -143,12 +148,8 @@ def process_assembly_files():
     finally:
         # Cleanup temp files
         for temp_file in temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    logger.debug(f"Cleaned up temp file: {temp_file}")
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup temp file {temp_file}: {str(cleanup_error)}")
+            if remove_file(temp_file):
+                logger.debug(f"Cleaned up temp file: {temp_file}")
 
 
 @assembly_bp.route('/download/<filename>')
@@ -156,30 +157,24 @@ def download_assembly_file(filename):
     """Download generated Excel report with security validation"""
     try:
         # Validate filename to prevent path traversal
-        secure_name = Path(filename).name
+        secure_name = os.path.basename(filename)
         if secure_name != filename:
             logger.warning(f"Potential path traversal attempt: {filename}")
             raise ValidationError("Invalid filename", field="filename", value=filename)
         
-        # Check if file exists and is in allowed directory
-        file_path = Path(filename)
-        if not file_path.exists():
-            logger.warning(f"Attempted download of non-existent file: {filename}")
-            raise FileOperationError(f"File not found: {filename}")
-        
-        # Additional security: ensure file is in current directory or subdirectory
-        try:
-            file_path.resolve().relative_to(Path.cwd())
-        except ValueError:
-            logger.warning(f"Attempted download of file outside working directory: {filename}")
-            raise ValidationError("File access denied", field="filename", value=filename)
-        
         logger.info(f"File download initiated: {filename}", extra={
             'operation': 'file_download',
             'download_filename': filename
         })
         
-        return send_file(filename, as_attachment=True, download_name=filename)
+        # send_from_directory safe-joins the name under the download root and
+        # answers conditional/range requests without re-sending unchanged files
+        try:
+            return send_from_directory(DOWNLOAD_ROOT, secure_name, as_attachment=True,
+                                       conditional=True, max_age=0)
+        except NotFound:
+            logger.warning(f"Attempted download of non-existent file: {filename}")
+            raise FileOperationError(f"File not found: {filename}")
         
     except ValidationError as e:
         logger.warning(f"Validation error in file download: {e.message}")
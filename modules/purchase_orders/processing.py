@@ -16,29 +16,53 @@ def load_excluded_suppliers():
         return []
 
 
+def _sales_header_columns(rows, header_index):
+    """Returns (column count, first column name) as pd.read_excel would see the header row."""
+    # pandas trims trailing empty cells per row and pads every row to the widest one
+    width = 0
+    for row in rows:
+        trimmed = len(row)
+        while trimmed and row[trimmed - 1] is None:
+            trimmed -= 1
+        width = max(width, trimmed)
+    
+    header = rows[header_index] if header_index < len(rows) else ()
+    first_column = header[0] if header and header[0] is not None else 'Unnamed: 0'
+    return width, str(first_column)
+
+
 def validate_sales_report(file_path):
     """Validates a sales report file and returns validation result."""
     try:
+        # Only the header area is needed: open the workbook once, streaming, and
+        # read the first 16 rows (combined header on row 6, separate on row 5)
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            rows = list(workbook['Sheet'].iter_rows(min_row=1, max_row=16, values_only=True))
+        finally:
+            workbook.close()
+        
         # Try to read as combined format first
-        df = pd.read_excel(file_path, sheet_name='Sheet', skiprows=5, nrows=10)
+        column_count, first_column = _sales_header_columns(rows[:16], 5)
         
         # Check if it has the combined format pattern
-        if len(df.columns) > 10 and 'SKU' in str(df.columns[0]).upper():
+        if column_count > 10 and 'SKU' in first_column.upper():
             return {
                 'valid': True,
                 'file_type': 'combined',
                 'message': '✅ Combined sales report detected - contains Sales, COGS, Profit, and Quantity data',
-                'columns_found': len(df.columns)
+                'columns_found': column_count
             }
         
         # Try separate format
-        df_separate = pd.read_excel(file_path, sheet_name='Sheet', skiprows=4, nrows=10)
-        if 'SKU' in str(df_separate.columns[0]).upper() and len(df_separate.columns) >= 12:
+        column_count, first_column = _sales_header_columns(rows[:15], 4)
+        if 'SKU' in first_column.upper() and column_count >= 12:
             return {
                 'valid': True,
                 'file_type': 'separate',
                 'message': '✅ Individual sales report detected - contains monthly data',
-                'columns_found': len(df_separate.columns)
+                'columns_found': column_count
             }
         
         return {
@@ -480,51 +504,31 @@ def generate_po_csv(df, output_filename="purchase_order.csv"):
     print(f"PO file '{output_filename}' generated successfully.")
 
 
-def run_po_generation(upload_folder, location):
+def run_po_generation(inputs, location):
     """
     Main function to run the PO generation process for a specific location.
+    
+    inputs maps each report type ('sales', 'replenishment', 'inventory',
+    'availability') to the path of its file; the files are read in place.
     """
     print(f"Starting PO Generation Process for {location.upper()}...")
 
-    # Define file patterns
-    sales_pattern = os.path.join(upload_folder, "Sales by Product Details Report - Sales.xlsx")
-    cogs_pattern = os.path.join(upload_folder, "Sales by Product Details Report - COGS.xlsx")
-    profit_pattern = os.path.join(upload_folder, "Sales by Product Details Report - Profit.xlsx")
-    quantity_pattern = os.path.join(upload_folder, "Sales by Product Details Report - Quantity.xlsx")
-    # Try both filename formats (with spaces and with underscores)
-    replenishment_pattern1 = os.path.join(upload_folder, f"replenishment-Combined {location.upper()} Warehouses-variants-*.csv")
-    replenishment_pattern2 = os.path.join(upload_folder, f"replenishment-Combined_{location.upper()}_Warehouses-variants-*.csv")
-    
-    # Use whichever pattern finds a file
-    if glob.glob(replenishment_pattern1):
-        replenishment_pattern = replenishment_pattern1
+    # The loaders take glob patterns, so escape the exact paths
+    replenishment_pattern = glob.escape(inputs['replenishment'])
+    inventory_pattern = glob.escape(inputs['inventory'])
+    availability_pattern = glob.escape(inputs['availability'])
+
+    # The uploaded sales report is the combined Sales by Product Details Report
+    print("Loading combined Sales by Product Details Report...")
+    combined_data = load_combined_sales_report(inputs['sales'])
+    if combined_data:
+        sales_df = combined_data['sales']
+        cogs_df = combined_data['cogs'] 
+        profit_df = combined_data['profit']
+        quantity_df = combined_data['quantity']
     else:
-        replenishment_pattern = replenishment_pattern2
-    inventory_pattern = os.path.join(upload_folder, "InventoryList_*.csv")
-    availability_pattern = os.path.join(upload_folder, "AvailabilityReport_*.csv")
-
-    # Try to load combined sales report first, fall back to separate files
-    combined_sales_pattern = os.path.join(upload_folder, "Sales by Product Details Report.xlsx")
-    combined_files = glob.glob(combined_sales_pattern)
-    
-    if combined_files:
-        print("Found combined Sales by Product Details Report - using combined file...")
-        combined_data = load_combined_sales_report(combined_files[0])
-        if combined_data:
-            sales_df = combined_data['sales']
-            cogs_df = combined_data['cogs'] 
-            profit_df = combined_data['profit']
-            quantity_df = combined_data['quantity']
-        else:
-            print("Error loading combined file, aborting.")
-            return None
-    else:
-        print("Combined file not found - looking for separate sales files...")
-        # Load separate sales reports (backward compatibility)
-        sales_df = load_sales_report(sales_pattern, "TotalSales")
-        cogs_df = load_sales_report(cogs_pattern, "TotalCOGS")
-        profit_df = load_sales_report(profit_pattern, "TotalProfit")
-        quantity_df = load_sales_report(quantity_pattern, "TotalQuantity")
+        print("Error loading combined file, aborting.")
+        return None
 
     replenishment_df = load_replenishment_report(replenishment_pattern)
     inventory_df = load_inventory_list(inventory_pattern)
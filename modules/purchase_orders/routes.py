@@ -1,9 +1,15 @@
 from flask import render_template, request, jsonify, send_from_directory, redirect, url_for, session
 import os
-import shutil
+import time
+import secrets
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from . import po_bp
-from .processing import validate_sales_report, validate_replenishment_report, validate_inventory_list, validate_availability_report, run_po_generation
-from utils.file_validation import FileValidator, create_secure_filename
+from utils.file_validation import FileValidator, create_secure_filename, save_uploaded_file
+from utils.file_cleanup import remove_file
 from utils.exceptions import FileOperationError, ValidationError, DataProcessingError
 from utils.logging_config import get_logger, LoggerMixin
 from utils.alerting import send_error_alert, AlertSeverity
@@ -11,6 +17,81 @@ from utils.alerting import send_error_alert, AlertSeverity
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Module-specific staging directory (validated uploads, read in place by PO generation)
+STAGING_DIR = os.path.join('staging', 'purchase_orders')
+os.makedirs(STAGING_DIR, exist_ok=True)
+
+# Content validation results keyed by (file type, SHA-256 of the upload), so
+# re-uploading an identical file skips opening it with pandas again
+VALIDATION_CACHE_MAX_ENTRIES = 128
+VALIDATION_CACHE_TTL_SECONDS = 6 * 60 * 60  # 6 hours
+_validation_cache = OrderedDict()  # key -> (stored at, content result)
+_validation_cache_lock = threading.Lock()
+
+
+def get_cached_validation(cache_key):
+    """Return the cached content validation result for an upload, or None"""
+    with _validation_cache_lock:
+        entry = _validation_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, content_result = entry
+        if time.monotonic() - stored_at > VALIDATION_CACHE_TTL_SECONDS:
+            del _validation_cache[cache_key]
+            return None
+        _validation_cache.move_to_end(cache_key)
+        return dict(content_result)
+
+
+def cache_validation(cache_key, content_result):
+    """Remember a content validation result, evicting the least recently used entry"""
+    with _validation_cache_lock:
+        _validation_cache[cache_key] = (time.monotonic(), dict(content_result))
+        _validation_cache.move_to_end(cache_key)
+        if len(_validation_cache) > VALIDATION_CACHE_MAX_ENTRIES:
+            _validation_cache.popitem(last=False)
+
+
+# Validated upload details per browser session, kept server-side so the session
+# cookie only carries an opaque upload id
+UPLOAD_SESSIONS_MAX_ENTRIES = 256
+_upload_sessions = OrderedDict()  # upload id -> {file type: upload details}
+_upload_sessions_lock = threading.Lock()
+
+
+def record_validated_file(file_type, details):
+    """Store a validated upload's details under the current session's upload id"""
+    upload_id = session.get('upload_id')
+    if upload_id is None:
+        upload_id = session['upload_id'] = secrets.token_urlsafe(16)
+    
+    with _upload_sessions_lock:
+        _upload_sessions.setdefault(upload_id, {})[file_type] = details
+        _upload_sessions.move_to_end(upload_id)
+        if len(_upload_sessions) > UPLOAD_SESSIONS_MAX_ENTRIES:
+            _upload_sessions.popitem(last=False)
+
+
+def clear_validated_files():
+    """Forget the validated uploads recorded for the current session"""
+    upload_id = session.get('upload_id')
+    if upload_id is not None:
+        with _upload_sessions_lock:
+            _upload_sessions.pop(upload_id, None)
+
+
+@functools.cache
+def get_content_validators():
+    """Content validator for each uploadable file type (pandas is imported on first use)"""
+    from .processing import (validate_sales_report, validate_replenishment_report,
+                             validate_inventory_list, validate_availability_report)
+    return {
+        'sales': validate_sales_report,
+        'replenishment': validate_replenishment_report,
+        'inventory': validate_inventory_list,
+        'availability': validate_availability_report,
+    }
+
 
 class PurchaseOrderRoutes(LoggerMixin):
     """Purchase Order routes with logging capabilities"""
@@ -26,6 +107,7 @@ def po_index():
     """Main purchase order generation interface"""
     try:
         # Clear any previous session data
+        clear_validated_files()
         session.clear()
         logger.info("Purchase order interface accessed", extra={'operation': 'po_index_access'})
         return render_template('modules/purchase_orders/index.html')
@@ -78,13 +160,11 @@ def upload_single_file():
         # Create secure filename
         secure_name = create_secure_filename(file_type, validation_result['original_filename'])
         
-        # Create module-specific staging directory
-        staging_dir = os.path.join('staging', 'purchase_orders')
-        os.makedirs(staging_dir, exist_ok=True)
-        
         # Save file to staging area with secure filename
-        temp_path = os.path.join(staging_dir, secure_name)
-        file_storage.save(temp_path)
+        temp_path = os.path.join(STAGING_DIR, secure_name)
+        upload_hash = hashlib.sha256()
+        save_uploaded_file(file_storage, temp_path, hasher=upload_hash)
+        cache_key = (file_type, upload_hash.hexdigest())
         
         logger.info(f"File saved to staging", extra={
             'operation': 'file_save',
@@ -94,16 +174,13 @@ def upload_single_file():
         
         # Validate file content based on type
         try:
-            if file_type == 'sales':
-                content_result = validate_sales_report(temp_path)
-            elif file_type == 'replenishment':
-                content_result = validate_replenishment_report(temp_path)
-            elif file_type == 'inventory':
-                content_result = validate_inventory_list(temp_path)
-            elif file_type == 'availability':
-                content_result = validate_availability_report(temp_path)
-            else:
-                raise ValidationError(f"Unknown file type: {file_type}", field="file_type", value=file_type)
+            content_result = get_cached_validation(cache_key)
+            if content_result is None:
+                validator = get_content_validators().get(file_type)
+                if validator is None:
+                    raise ValidationError(f"Unknown file type: {file_type}", field="file_type", value=file_type)
+                content_result = validator(temp_path)
+                cache_validation(cache_key, content_result)
             
             logger.info(f"Content validation completed", extra={
                 'operation': 'content_validation',
@@ -114,27 +191,24 @@ def upload_single_file():
         except Exception as content_error:
             logger.error(f"Content validation failed: {str(content_error)}")
             # Clean up file on content validation failure
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+            if temp_path:
+                remove_file(temp_path)
             
             return jsonify({
                 'valid': False,
                 'message': f'❌ Content validation failed: {str(content_error)}'
             })
         
-        # Store validation result in session
-        if 'validated_files' not in session:
-            session['validated_files'] = {}
-        
+        # Store validation result server-side for this session
         if content_result.get('valid', False):
-            session['validated_files'][file_type] = {
+            record_validated_file(file_type, {
                 'filename': validation_result['original_filename'],
                 'secure_filename': secure_name,
                 'path': temp_path,
                 'message': content_result['message'],
                 'file_size': validation_result['file_size'],
-                'upload_timestamp': _import_datetime().datetime.now(_import_datetime().timezone.utc).isoformat()
-            }
+                'upload_timestamp': datetime.now(timezone.utc).isoformat()
+            })
             
             logger.info(f"File upload completed successfully", extra={
                 'operation': 'file_upload_success',
@@ -162,11 +236,8 @@ def upload_single_file():
         })
         
         # Clean up on error
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
+        if temp_path:
+            remove_file(temp_path)
         
         return jsonify({'valid': False, 'message': f'❌ Unexpected error: {str(e)}'})
 
@@ -177,67 +248,34 @@ def generate_po():
     try:
         location = request.args.get('location', 'nc')
         
-        # Create module-specific staging and upload directories
-        staging_dir = os.path.join('staging', 'purchase_orders')
-        upload_dir = os.path.join('uploads', 'purchase_orders')
-        os.makedirs(upload_dir, exist_ok=True)
-        
         # Check staging folder directly instead of relying on session
-        if not os.path.exists(staging_dir):
+        if not os.path.exists(STAGING_DIR):
             return render_template('modules/purchase_orders/error.html', 
                                  message='No files uploaded yet. Please upload files first.')
         
-        staging_files = os.listdir(staging_dir)
-        available_types = []
-        for f in staging_files:
-            if f.startswith('sales_'):
-                available_types.append('sales')
-            elif f.startswith('replenishment_'):
-                available_types.append('replenishment')
-            elif f.startswith('inventory_'):
-                available_types.append('inventory')
-            elif f.startswith('availability_'):
-                available_types.append('availability')
-        
+        # Find the most recent staging file for each type in one pass over the folder
         required_files = ['sales', 'replenishment', 'inventory', 'availability']
-        missing_files = [f for f in required_files if f not in available_types]
+        latest_staging = {}  # file type -> (staging path, mtime)
+        with os.scandir(STAGING_DIR) as entries:
+            for entry in entries:
+                file_type, separator, _ = entry.name.partition('_')
+                if not separator or file_type not in required_files:
+                    continue
+                file_time = entry.stat().st_mtime
+                current = latest_staging.get(file_type)
+                if current is None or file_time > current[1]:
+                    latest_staging[file_type] = (entry.path, file_time)
+        
+        missing_files = [f for f in required_files if f not in latest_staging]
         
         if missing_files:
             return render_template('modules/purchase_orders/error.html',
                                  message=f'Missing files: {", ".join(missing_files)}')
         
-        # Clear upload folder and copy validated files with standardized names
-        for f in os.listdir(upload_dir):
-            os.remove(os.path.join(upload_dir, f))
-        
-        # Copy files with standardized names for processing
-        file_mapping = {
-            'sales': 'Sales by Product Details Report.xlsx',
-            'replenishment': f'replenishment-Combined {location.upper()} Warehouses-variants-temp.csv',
-            'inventory': 'InventoryList_temp.csv', 
-            'availability': 'AvailabilityReport_temp.csv'
-        }
-        
-        for file_type, standard_name in file_mapping.items():
-            if file_type in available_types:
-                # Find the most recent staging file for this type
-                staging_file = None
-                latest_time = 0
-                for f in staging_files:
-                    if f.startswith(f'{file_type}_'):
-                        file_path = os.path.join(staging_dir, f)
-                        file_time = os.path.getmtime(file_path)
-                        if file_time > latest_time:
-                            latest_time = file_time
-                            staging_file = f
-                
-                if staging_file:
-                    staging_path = os.path.join(staging_dir, staging_file)
-                    upload_path = os.path.join(upload_dir, standard_name)
-                    shutil.copy2(staging_path, upload_path)
-        
-        # Generate PO
-        output_filename = run_po_generation(upload_dir, location)
+        # Generate PO straight from the staged files
+        from .processing import run_po_generation
+        inputs = {file_type: staging_path for file_type, (staging_path, _) in latest_staging.items()}
+        output_filename = run_po_generation(inputs, location)
         
         if output_filename:
             return render_template('modules/purchase_orders/success.html',
@@ -268,7 +306,7 @@ def manage_suppliers():
         
         try:
             with open('excluded_suppliers.txt', 'w') as f:
-                f.write('\n'.join(suppliers_list))
+                f.writelines(line + '\n' for line in suppliers_list)
             return render_template('modules/purchase_orders/manage_suppliers.html',
                                  suppliers_text='\n'.join(suppliers_list),
                                  supplier_count=len(suppliers_list),
@@ -282,9 +320,11 @@ def manage_suppliers():
     # Load current suppliers for display
     try:
         if os.path.exists('excluded_suppliers.txt'):
+            # Single pass over the file: strip each line and drop blanks
             with open('excluded_suppliers.txt', 'r') as f:
-                suppliers_text = f.read().strip()
-                supplier_count = len([line for line in suppliers_text.split('\n') if line.strip()])
+                suppliers_list = [line for line in (raw.strip() for raw in f) if line]
+            suppliers_text = '\n'.join(suppliers_list)
+            supplier_count = len(suppliers_list)
         else:
             suppliers_text = ''
             supplier_count = 0
@@ -295,9 +335,3 @@ def manage_suppliers():
     return render_template('modules/purchase_orders/manage_suppliers.html',
                          suppliers_text=suppliers_text,
                          supplier_count=supplier_count)
-
-
-def _import_datetime():
-    """Helper function to import datetime module"""
-    import datetime
-    return datetime
@@ -0,0 +1,77 @@
+"""
+Tests for the buffered log file handler in utils.logging_config
+"""
+import glob
+import logging
+import os
+import tempfile
+import unittest
+
+from utils.logging_config import BufferedRotatingFileHandler
+
+
+class BufferedRotatingFileHandlerTests(unittest.TestCase):
+    """Every record must reach disk across rollovers, including with delay=True"""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp_dir.name, 't.log')
+        self.logger = logging.getLogger(f'test_buffered_rotation.{self.id()}')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+    
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.tmp_dir.cleanup()
+    
+    def _lines_on_disk(self, path):
+        lines = []
+        for log_file in glob.glob(path + '*'):
+            with open(log_file, encoding='utf-8') as f:
+                lines.extend(line.rstrip('\n') for line in f)
+        return lines
+    
+    def _log_and_close(self, handler, count, level=logging.INFO):
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.addHandler(handler)
+        for i in range(count):
+            self.logger.log(level, 'record %03d padded to force a rollover quickly', i)
+        self.logger.removeHandler(handler)
+        handler.close()
+    
+    def test_all_lines_written_after_rollover_with_delay(self):
+        for count in (3, 9):
+            with self.subTest(count=count):
+                for old in glob.glob(self.log_path + '*'):
+                    os.remove(old)
+                handler = BufferedRotatingFileHandler(self.log_path, maxBytes=100, backupCount=20, delay=True)
+                self._log_and_close(handler, count)
+                self.assertGreater(len(glob.glob(self.log_path + '*')), 1)
+                self.assertEqual(len(self._lines_on_disk(self.log_path)), count)
+    
+    def test_error_copy_written_after_rollover_with_delay(self):
+        error_path = os.path.join(self.tmp_dir.name, 'errors.log')
+        error_handler = BufferedRotatingFileHandler(error_path, maxBytes=100, backupCount=20, delay=True)
+        error_handler.setLevel(logging.ERROR)
+        handler = BufferedRotatingFileHandler(self.log_path, maxBytes=100, backupCount=20, delay=True,
+                                              copy_to=error_handler)
+        self._log_and_close(handler, 9, level=logging.ERROR)
+        error_handler.close()
+        
+        self.assertEqual(len(self._lines_on_disk(self.log_path)), 9)
+        self.assertEqual(len(self._lines_on_disk(error_path)), 9)
+    
+    def test_error_record_on_disk_before_close(self):
+        handler = BufferedRotatingFileHandler(self.log_path, maxBytes=100, backupCount=20, delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.addHandler(handler)
+        for i in range(9):
+            self.logger.error('record %03d padded to force a rollover quickly', i)
+            # ERROR records are flushed straight away, even the one that triggered a rollover
+            self.assertEqual(len(self._lines_on_disk(self.log_path)), i + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,15 +3,31 @@ Error Alerting System for DBI Operations Hub
 Provides error notification and alerting capabilities.
 """
 import os
-import json
+import sys
+import time
+import queue
+import atexit
+import threading
 import traceback
 from datetime import datetime
 from typing import Dict, List, Optional
+import orjson
 from .exceptions import DBIOperationsError
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Alert records are serialized as one compact JSON line each; non-str keys and
+# numpy values can appear in alert context
+ALERT_JSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Alerts are handed to a background worker; when the queue is full new alerts are dropped
+ALERT_QUEUE_MAX_SIZE = 1024
+ALERT_BATCH_SIZE = 64  # Alerts delivered to the handlers together
+
+# How often the open alert file is checked for having been deleted
+ALERT_FILE_CHECK_INTERVAL_SECONDS = 5
+
 
 class AlertSeverity:
     """Alert severity levels"""
@@ -33,7 +49,8 @@ class ErrorAlert:
         self.user_id = user_id
         self.error_type = type(error).__name__
         self.error_message = str(error)
-        self.traceback = traceback.format_exc() if traceback.format_exc().strip() != 'NoneType: None' else None
+        # Only format a traceback when an exception is actually being handled
+        self.traceback = traceback.format_exc() if sys.exc_info()[0] is not None else None
     
     def to_dict(self) -> Dict:
         """Convert alert to dictionary"""
@@ -61,7 +78,14 @@ class AlertManager:
     
     def __init__(self):
         self.alert_handlers = []
+        self.dropped_alerts = 0
+        self._queue = queue.Queue(maxsize=ALERT_QUEUE_MAX_SIZE)
+        self._worker = None
+        self._worker_lock = threading.Lock()
         self._setup_default_handlers()
+        
+        # Deliver anything still queued when the interpreter exits
+        atexit.register(self.flush)
     
     def _setup_default_handlers(self):
         """Setup default alert handlers"""
@@ -95,12 +119,58 @@ class AlertManager:
             }
         )
         
+        # Handlers run on the background worker so alert IO stays off the request path
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(alert)
+        except queue.Full:
+            self.dropped_alerts += 1
+            logger.warning(f"Alert queue full, dropped alert ({self.dropped_alerts} dropped so far)")
+    
+    def _ensure_worker(self):
+        """Start the dispatch thread if it is not running (e.g. first alert, or after a fork)"""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            return
+        
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._drain_queue, name='alert-dispatch', daemon=True)
+                self._worker.start()
+    
+    def _drain_queue(self):
+        """Worker loop: deliver queued alerts to the handlers in batches"""
+        while True:
+            batch = [self._queue.get()]
+            batch.extend(self._take_queued(ALERT_BATCH_SIZE - 1))
+            self._dispatch(batch)
+    
+    def _take_queued(self, limit: int) -> List[ErrorAlert]:
+        """Take up to limit alerts that are already queued, without waiting"""
+        alerts = []
+        while len(alerts) < limit:
+            try:
+                alerts.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return alerts
+    
+    def _dispatch(self, alerts: List[ErrorAlert]):
+        """Deliver a batch of alerts through all configured handlers"""
         for handler in self.alert_handlers:
             try:
-                handler.handle_alert(alert)
+                handler.handle_alerts(alerts)
             except Exception as handler_error:
                 logger.error(f"Alert handler failed: {handler_error}")
     
+    def flush(self):
+        """Deliver all queued alerts on the calling thread"""
+        while True:
+            batch = self._take_queued(ALERT_BATCH_SIZE)
+            if not batch:
+                return
+            self._dispatch(batch)
+    
     def add_handler(self, handler):
         """Add a custom alert handler"""
         self.alert_handlers.append(handler)
@@ -112,6 +182,14 @@ class AlertHandler:
     def handle_alert(self, alert: ErrorAlert):
         """Handle an alert (to be implemented by subclasses)"""
         raise NotImplementedError
+    
+    def handle_alerts(self, alerts: List[ErrorAlert]):
+        """Handle a batch of alerts; handlers that can write batches together override this"""
+        for alert in alerts:
+            try:
+                self.handle_alert(alert)
+            except Exception as handler_error:
+                logger.error(f"Alert handler failed: {handler_error}")
 
 
 class FileAlertHandler(AlertHandler):
@@ -121,12 +199,58 @@ class FileAlertHandler(AlertHandler):
         self.alert_file = alert_file
         # Ensure directory exists
         os.makedirs(os.path.dirname(alert_file), exist_ok=True)
+        
+        # Unbuffered binary handle opened on the first alert and kept for later ones,
+        # so each alert line reaches the file in a single write
+        self._file = None
+        self._checked_at = 0.0  # When the open file was last confirmed to still exist
+        self._lock = threading.Lock()
+        atexit.register(self._close_file)
+    
+    def _close_file(self):
+        """Close whichever alert file is currently open"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def _get_file(self):
+        """Return the open alert file, reopening it if it was deleted (e.g. by log cleanup) or closed"""
+        if self._file is not None and not self._file.closed:
+            # Cleanup only removes files idle for days, so a recently checked file is still there
+            now = time.monotonic()
+            if now - self._checked_at >= ALERT_FILE_CHECK_INTERVAL_SECONDS:
+                if os.fstat(self._file.fileno()).st_nlink == 0:
+                    self._file.close()
+                    self._file = None
+                self._checked_at = now
+        
+        if self._file is not None and self._file.closed:
+            self._file = None
+        
+        if self._file is None:
+            self._file = open(self.alert_file, 'ab', buffering=0)
+            self._checked_at = time.monotonic()
+        return self._file
     
     def handle_alert(self, alert: ErrorAlert):
         """Write alert to file in JSON Lines format"""
+        self.handle_alerts([alert])
+    
+    def handle_alerts(self, alerts: List[ErrorAlert]):
+        """Write a batch of alerts to file with a single write"""
+        lines = []
+        for alert in alerts:
+            try:
+                lines.append(orjson.dumps(alert.to_dict(), option=ALERT_JSON_OPTIONS))
+            except Exception as e:
+                logger.error(f"Failed to write alert to file: {e}")
+        
+        if not lines:
+            return
         try:
-            with open(self.alert_file, 'a') as f:
-                f.write(json.dumps(alert.to_dict()) + '\n')
+            with self._lock:
+                self._get_file().write(b''.join(lines))
         except Exception as e:
             logger.error(f"Failed to write alert to file: {e}")
 
@@ -134,6 +258,9 @@ class FileAlertHandler(AlertHandler):
 class EmailAlertHandler(AlertHandler):
     """Sends alerts via email (placeholder for future implementation)"""
     
+    # Only high and critical severity alerts are sent via email
+    EMAIL_SEVERITIES = frozenset((AlertSeverity.HIGH, AlertSeverity.CRITICAL))
+    
     def __init__(self):
         self.smtp_server = os.environ.get('ALERT_SMTP_SERVER')
         self.smtp_port = int(os.environ.get('ALERT_SMTP_PORT', '587'))
@@ -143,14 +270,17 @@ class EmailAlertHandler(AlertHandler):
         
         # Clean up recipients list
         self.alert_recipients = [email.strip() for email in self.alert_recipients if email.strip()]
+        
+        # Settings are read once, so whether email is usable is known up front
+        self.configured = all([self.smtp_server, self.smtp_username, self.smtp_password, self.alert_recipients])
     
     def handle_alert(self, alert: ErrorAlert):
         """Send alert via email"""
         # Only send high and critical severity alerts via email
-        if alert.severity not in [AlertSeverity.HIGH, AlertSeverity.CRITICAL]:
+        if alert.severity not in self.EMAIL_SEVERITIES:
             return
         
-        if not all([self.smtp_server, self.smtp_username, self.smtp_password, self.alert_recipients]):
+        if not self.configured:
             logger.warning("Email alerting not properly configured")
             return
         
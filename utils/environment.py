@@ -3,13 +3,37 @@ Environment Variable Validation for DBI Operations Hub
 Validates required environment variables on startup with clear error messages.
 """
 import os
-import secrets
+import sys
+import functools
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 from .exceptions import ConfigurationError
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Environment variables the validator reads; they are snapshotted once per process
+ENVIRONMENT_VARS = ('FLASK_ENV', 'SECRET_KEY', 'AZURE_STORAGE_CONNECTION_STRING', 'LOG_LEVEL', 'PORT')
+
+
+@functools.cache
+def _environment_snapshot() -> MappingProxyType:
+    """Read the validator's environment variables once (unset variables are omitted)"""
+    return MappingProxyType({name: os.environ[name] for name in ENVIRONMENT_VARS if name in os.environ})
+
+
+@functools.cache
+def _is_production() -> bool:
+    """Whether FLASK_ENV names a production environment (read once)"""
+    env = _environment_snapshot().get('FLASK_ENV', 'development').lower()
+    return env in ['production', 'prod']
+
+
+def refresh_environment():
+    """Discard the environment snapshot so the next validation re-reads os.environ"""
+    _environment_snapshot.cache_clear()
+    _is_production.cache_clear()
+
 
 class EnvironmentValidator:
     """Validates environment variables and provides clear error messages"""
@@ -35,8 +59,7 @@ class EnvironmentValidator:
     @staticmethod
     def is_production() -> bool:
         """Check if running in production environment"""
-        env = os.environ.get('FLASK_ENV', 'development').lower()
-        return env in ['production', 'prod']
+        return _is_production()
     
     @staticmethod
     def validate_secret_key() -> str:
@@ -49,7 +72,7 @@ class EnvironmentValidator:
         Raises:
             ConfigurationError: If secret key is invalid in production
         """
-        secret_key = os.environ.get('SECRET_KEY')
+        secret_key = _environment_snapshot().get('SECRET_KEY')
         
         if EnvironmentValidator.is_production():
             if not secret_key:
@@ -75,6 +98,7 @@ class EnvironmentValidator:
         
         # Generate secure key for development if not set
         if not secret_key:
+            import secrets
             secret_key = secrets.token_urlsafe(32)
             logger.info("Generated secure SECRET_KEY for development environment")
         
@@ -94,10 +118,11 @@ class EnvironmentValidator:
         missing_vars = []
         invalid_vars = []
         validated_vars = {}
+        environment = _environment_snapshot()
         
         # Check required variables
         for var in EnvironmentValidator.REQUIRED_PRODUCTION_VARS:
-            value = os.environ.get(var)
+            value = environment.get(var)
             
             if var == 'SECRET_KEY':
                 # Special handling for secret key
@@ -113,7 +138,7 @@ class EnvironmentValidator:
                 validated_vars[var] = value
         
         # Check Azure storage connection string if provided
-        azure_conn = os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
+        azure_conn = environment.get('AZURE_STORAGE_CONNECTION_STRING')
         if azure_conn:
             if not azure_conn.startswith('DefaultEndpointsProtocol='):
                 invalid_vars.append('AZURE_STORAGE_CONNECTION_STRING')
@@ -135,34 +160,43 @@ class EnvironmentValidator:
     @staticmethod
     def get_environment_info() -> Dict[str, any]:
         """Get comprehensive environment information"""
+        environment = _environment_snapshot()
         env_info = {
-            'environment': os.environ.get('FLASK_ENV', 'development'),
+            'environment': environment.get('FLASK_ENV', 'development'),
             'is_production': EnvironmentValidator.is_production(),
-            'port': os.environ.get('PORT', '5000'),
-            'log_level': os.environ.get('LOG_LEVEL', 'INFO'),
-            'has_azure_storage': bool(os.environ.get('AZURE_STORAGE_CONNECTION_STRING')),
-            'python_version': os.sys.version,
+            'port': environment.get('PORT', '5000'),
+            'log_level': environment.get('LOG_LEVEL', 'INFO'),
+            'has_azure_storage': bool(environment.get('AZURE_STORAGE_CONNECTION_STRING')),
+            'python_version': sys.version,
             'platform': os.name,
         }
         
         return env_info
     
     @staticmethod
-    def log_startup_info():
-        """Log environment information on startup"""
-        env_info = EnvironmentValidator.get_environment_info()
+    def log_startup_info(validated_vars: Optional[Dict[str, str]] = None):
+        """
+        Log environment information on startup
+        
+        Args:
+            validated_vars: Result of validate_required_vars, reused instead of re-reading the environment
+        """
+        environment = _environment_snapshot()
+        environment_name = (validated_vars or {}).get('FLASK_ENV')
+        if environment_name is None:
+            environment_name = environment.get('FLASK_ENV', 'development')
         
         logger.info("🏢 DBI Operations Hub starting up")
-        logger.info(f"Environment: {env_info['environment']}")
-        logger.info(f"Production mode: {env_info['is_production']}")
-        logger.info(f"Port: {env_info['port']}")
-        logger.info(f"Log level: {env_info['log_level']}")
-        logger.info(f"Azure Storage: {'configured' if env_info['has_azure_storage'] else 'not configured'}")
+        logger.info(f"Environment: {environment_name}")
+        logger.info(f"Production mode: {EnvironmentValidator.is_production()}")
+        logger.info(f"Port: {environment.get('PORT', '5000')}")
+        logger.info(f"Log level: {environment.get('LOG_LEVEL', 'INFO')}")
+        logger.info(f"Azure Storage: {'configured' if environment.get('AZURE_STORAGE_CONNECTION_STRING') else 'not configured'}")
         
         # Warn about missing recommended variables
         missing_recommended = []
         for var in EnvironmentValidator.RECOMMENDED_VARS:
-            if not os.environ.get(var):
+            if not environment.get(var):
                 missing_recommended.append(var)
         
         if missing_recommended:
@@ -182,7 +216,7 @@ def validate_environment() -> Dict[str, str]:
     try:
         validator = EnvironmentValidator()
         validated_vars = validator.validate_required_vars()
-        validator.log_startup_info()
+        validator.log_startup_info(validated_vars)
         return validated_vars
     except ConfigurationError as e:
         logger.error(f"Environment validation failed: {e.message}")
@@ -194,4 +228,5 @@ def validate_environment() -> Dict[str, str]:
 
 def generate_secure_secret_key() -> str:
     """Generate a secure secret key for development/testing"""
+    import secrets
     return secrets.token_urlsafe(32)
@@ -2,6 +2,7 @@
 Custom Exception Types for DBI Operations Hub
 Provides specific exception classes for better error handling and debugging.
 """
+import functools
 
 
 class DBIOperationsError(Exception):
@@ -14,6 +15,11 @@ class DBIOperationsError(Exception):
 
     def to_dict(self):
         """Convert exception to dictionary for JSON responses"""
+        return self.dict_repr
+
+    @functools.cached_property
+    def dict_repr(self):
+        """Dictionary form of the exception, built on first use and reused by later calls"""
         return {
             'error': True,
             'message': self.message,
@@ -3,16 +3,21 @@ File Cleanup Utilities for DBI Operations Hub
 Handles scheduled cleanup of temporary files and old uploads.
 """
 import os
+import stat
 import time
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timedelta
 from typing import List, Dict
 from .logging_config import get_logger, LoggerMixin
 from .exceptions import FileOperationError
 
 logger = get_logger(__name__)
 
+# Upper bound on rule directories cleaned at the same time
+CLEANUP_MAX_WORKERS = 4
+
 
 class FileCleanupManager(LoggerMixin):
     """Manages cleanup of temporary files and directories"""
@@ -27,6 +32,13 @@ class FileCleanupManager(LoggerMixin):
         self.cleanup_interval_hours = cleanup_interval_hours
         self.cleanup_thread = None
         self.running = False
+        self._stop_event = threading.Event()  # Set to wake the cleanup loop and stop it
+        
+        # Per rule directory, from its last walk: the oldest file mtime that was kept and
+        # the mtime of every directory scanned. Adding or removing an entry changes its
+        # directory's mtime, so an unchanged tree whose oldest file is still within the
+        # retention period has nothing to delete and is not walked again.
+        self._tree_cache = {}  # rule directory -> (oldest kept mtime, {directory: st_mtime_ns})
         
         # Default cleanup rules (file age in hours)
         self.cleanup_rules = {
@@ -48,6 +60,7 @@ class FileCleanupManager(LoggerMixin):
             return
         
         self.running = True
+        self._stop_event.clear()
         self.cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
         self.cleanup_thread.start()
         self.log_operation("Started scheduled file cleanup service")
@@ -55,6 +68,7 @@ class FileCleanupManager(LoggerMixin):
     def stop_scheduled_cleanup(self):
         """Stop the scheduled cleanup process"""
         self.running = False
+        self._stop_event.set()
         if self.cleanup_thread and self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=5)
         self.log_operation("Stopped scheduled file cleanup service")
@@ -67,12 +81,9 @@ class FileCleanupManager(LoggerMixin):
             except Exception as e:
                 self.log_error(f"Error during scheduled cleanup: {str(e)}", operation="scheduled_cleanup")
             
-            # Sleep for the specified interval
-            sleep_seconds = self.cleanup_interval_hours * 3600
-            for _ in range(sleep_seconds):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Sleep for the specified interval, waking immediately when stopped
+            if self._stop_event.wait(self.cleanup_interval_hours * 3600):
+                break
     
     def run_cleanup(self) -> Dict[str, int]:
         """
@@ -90,19 +101,27 @@ class FileCleanupManager(LoggerMixin):
         
         self.log_operation("Starting file cleanup process", operation="run_cleanup")
         
-        for directory, max_age_hours in self.cleanup_rules.items():
-            try:
-                dir_stats = self._cleanup_directory(directory, max_age_hours)
-                cleanup_stats['files_deleted'] += dir_stats['files_deleted']
-                cleanup_stats['bytes_freed'] += dir_stats['bytes_freed']
-                cleanup_stats['directories_cleaned'] += 1
-            except Exception as e:
-                cleanup_stats['errors'] += 1
-                self.log_error(
-                    f"Error cleaning directory {directory}: {str(e)}", 
-                    operation="cleanup_directory",
-                    directory=directory
-                )
+        # The rule directories are independent and IO-bound, so they are cleaned concurrently
+        rules = list(self.cleanup_rules.items())
+        with ThreadPoolExecutor(max_workers=max(1, min(CLEANUP_MAX_WORKERS, len(rules)))) as executor:
+            futures = {
+                executor.submit(self._cleanup_directory, directory, max_age_hours): directory
+                for directory, max_age_hours in rules
+            }
+            for future in as_completed(futures):
+                directory = futures[future]
+                try:
+                    dir_stats = future.result()
+                    cleanup_stats['files_deleted'] += dir_stats['files_deleted']
+                    cleanup_stats['bytes_freed'] += dir_stats['bytes_freed']
+                    cleanup_stats['directories_cleaned'] += 1
+                except Exception as e:
+                    cleanup_stats['errors'] += 1
+                    self.log_error(
+                        f"Error cleaning directory {directory}: {str(e)}", 
+                        operation="cleanup_directory",
+                        directory=directory
+                    )
         
         self.log_operation(
             f"Cleanup completed: deleted {cleanup_stats['files_deleted']} files, "
@@ -129,60 +148,115 @@ class FileCleanupManager(LoggerMixin):
         if not os.path.exists(directory):
             return stats
         
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-        cutoff_timestamp = cutoff_time.timestamp()
+        cutoff_timestamp = time.time() - max_age_hours * 3600
+        
+        cached = self._tree_cache.get(directory)
+        if cached is not None and self._tree_unchanged(cached, cutoff_timestamp):
+            return stats
+        
+        # Delete old files and empty subdirectories in one bottom-up pass
+        directory_mtimes = {}
+        oldest_kept = self._cleanup_tree(directory, cutoff_timestamp, stats, directory_mtimes)
+        self._tree_cache[directory] = (oldest_kept, directory_mtimes)
+        
+        return stats
+    
+    @staticmethod
+    def _tree_unchanged(cached, cutoff_timestamp: float) -> bool:
+        """Whether a previously walked tree is untouched and still has nothing old enough to delete"""
+        oldest_kept, directory_mtimes = cached
+        if oldest_kept < cutoff_timestamp:
+            return False
+        
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime_ns for path, mtime_ns in directory_mtimes.items())
+        except OSError:
+            return False
+    
+    def _cleanup_tree(self, directory: str, cutoff_timestamp: float, stats: Dict[str, int],
+                      directory_mtimes: Dict[str, int], remove_if_empty: bool = False) -> float:
+        """
+        Delete files older than the cutoff under directory, then the directory itself if empty
+        
+        Args:
+            directory: Directory to scan
+            cutoff_timestamp: Files modified before this time are deleted
+            stats: Cleanup statistics, updated in place
+            directory_mtimes: Filled with the mtime of each directory as it was scanned
+            remove_if_empty: Remove directory once its contents are processed (not for rule roots)
+            
+        Returns:
+            Oldest mtime of the files kept under directory (inf if none)
+        """
+        # Skip building per-file debug records when DEBUG logging is off
+        logger = self.logger
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        oldest_kept = float('inf')
+        files_deleted = 0
+        bytes_freed = 0
         
-        directory_path = Path(directory)
+        # Taken before scanning, so entries added during the scan force another walk
+        directory_mtimes[directory] = os.stat(directory).st_mtime_ns
         
-        # Clean files in the directory and all subdirectories
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file():
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    oldest_kept = min(oldest_kept, self._cleanup_tree(
+                        entry.path, cutoff_timestamp, stats, directory_mtimes, remove_if_empty=True))
+                    continue
+                
+                file_stat = None
                 try:
-                    file_stat = file_path.stat()
+                    # One lstat per entry; DirEntry caches it for the mtime/size reads below
+                    file_stat = entry.stat(follow_symlinks=False)
+                    if not stat.S_ISREG(file_stat.st_mode):
+                        continue
                     
                     # Check if file is older than cutoff
-                    if file_stat.st_mtime < cutoff_timestamp:
+                    if file_stat.st_mtime >= cutoff_timestamp:
+                        oldest_kept = min(oldest_kept, file_stat.st_mtime)
+                    else:
                         file_size = file_stat.st_size
-                        file_path.unlink()
-                        stats['files_deleted'] += 1
-                        stats['bytes_freed'] += file_size
+                        os.unlink(entry.path)
+                        files_deleted += 1
+                        bytes_freed += file_size
                         
-                        self.logger.debug(
-                            f"Deleted old file: {file_path}",
-                            extra={
-                                'operation': 'delete_old_file',
-                                'file_path': str(file_path),
-                                'file_age_hours': (time.time() - file_stat.st_mtime) / 3600,
-                                'file_size': file_size
-                            }
-                        )
+                        if debug_enabled:
+                            logger.debug(
+                                f"Deleted old file: {entry.path}",
+                                extra={
+                                    'operation': 'delete_old_file',
+                                    'file_path': entry.path,
+                                    'file_age_hours': (time.time() - file_stat.st_mtime) / 3600,
+                                    'file_size': file_size
+                                }
+                            )
                 
                 except (OSError, IOError) as e:
+                    # The file is still there; keep it counted so the next run retries it
+                    oldest_kept = min(oldest_kept, file_stat.st_mtime if file_stat else float('-inf'))
                     self.log_error(
-                        f"Failed to delete file {file_path}: {str(e)}",
+                        f"Failed to delete file {entry.path}: {str(e)}",
                         operation="delete_file",
-                        file_path=str(file_path)
+                        file_path=entry.path
                     )
         
-        # Clean up empty directories
-        self._cleanup_empty_directories(directory_path)
+        # Counted in locals during the scan and added to the shared totals once
+        stats['files_deleted'] += files_deleted
+        stats['bytes_freed'] += bytes_freed
         
-        return stats
-    
-    def _cleanup_empty_directories(self, directory_path: Path):
-        """Remove empty directories recursively"""
-        try:
-            for dir_path in sorted(directory_path.rglob('*'), key=lambda p: len(p.parts), reverse=True):
-                if dir_path.is_dir() and dir_path != directory_path:
-                    try:
-                        # Only remove if empty
-                        dir_path.rmdir()
-                        self.logger.debug(f"Removed empty directory: {dir_path}")
-                    except OSError:
-                        # Directory not empty, continue
-                        pass
-        except Exception as e:
-            self.log_error(f"Error cleaning empty directories: {str(e)}")
+        if remove_if_empty:
+            try:
+                # Only removed if empty
+                os.rmdir(directory)
+                del directory_mtimes[directory]
+                if debug_enabled:
+                    logger.debug(f"Removed empty directory: {directory}")
+            except OSError:
+                # Directory not empty, continue
+                pass
+        
+        return oldest_kept
     
     def cleanup_specific_files(self, file_patterns: List[str]) -> int:
         """
@@ -232,16 +306,28 @@ class FileCleanupManager(LoggerMixin):
         if not os.path.exists(directory):
             return info
         
-        directory_path = Path(directory)
+        total_size = 0
+        file_count = 0
+        pending = [directory]
         
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file():
-                try:
-                    info['file_count'] += 1
-                    info['total_size'] += file_path.stat().st_size
-                except (OSError, IOError):
-                    pass
+        # Iterative scandir walk; file types come from the directory listing
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            file_count += 1
+                            try:
+                                total_size += entry.stat().st_size
+                            except (OSError, IOError):
+                                pass
+            except OSError:
+                continue
         
+        info['total_size'] = total_size
+        info['file_count'] = file_count
         return info
 
 
@@ -274,3 +360,15 @@ def cleanup_temp_files() -> int:
         'logs/*.log.*'  # Rotated log files
     ]
     return cleanup_manager.cleanup_specific_files(temp_patterns)
+
+
+def remove_file(file_path: str) -> bool:
+    """Delete a single file if it exists; returns True when a file was removed"""
+    try:
+        os.remove(file_path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.warning(f"Failed to remove file {file_path}: {str(e)}")
+        return False
@@ -3,14 +3,27 @@ File Upload Validation Utilities
 Provides secure file upload validation with extension checking, MIME type verification, 
 and filename sanitization for the DBI Operations Hub.
 """
+import io
 import os
 import re
-import mimetypes
-from pathlib import Path
+import shutil
 from typing import Dict, List, Optional, Tuple
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
+try:
+    # RE2 matches in linear time, so crafted filenames cannot trigger backtracking
+    import re2 as filename_re
+except ImportError:
+    filename_re = re
+
+
+# Chunk size for copying in-memory uploads to disk
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # 1MB
+
+# Longest filename accepted (the common filesystem limit), checked before any pattern matching
+MAX_FILENAME_LENGTH = 255
+
 
 class FileValidationError(Exception):
     """Custom exception for file validation errors"""
@@ -22,8 +35,10 @@ class FileValidationError(Exception):
 
 class UnsupportedFileTypeError(FileValidationError):
     """Exception for unsupported file types"""
-    def __init__(self, filename: str, allowed_extensions: List[str]):
-        message = f"File '{filename}' has unsupported type. Allowed: {', '.join(allowed_extensions)}"
+    def __init__(self, filename: str, allowed_extensions: List[str], allowed_text: Optional[str] = None):
+        if allowed_text is None:
+            allowed_text = ', '.join(allowed_extensions)
+        message = f"File '{filename}' has unsupported type. Allowed: {allowed_text}"
         super().__init__(message, "UNSUPPORTED_FILE_TYPE")
 
 
@@ -46,6 +61,10 @@ class FileValidator:
         '.xls': ['application/vnd.ms-excel']
     }
     
+    # Allowed extensions as reported in rejection errors (built once)
+    ALLOWED_EXTENSION_NAMES = tuple(ALLOWED_EXTENSIONS)
+    ALLOWED_EXTENSIONS_TEXT = ', '.join(ALLOWED_EXTENSIONS)
+    
     # Maximum file sizes (in bytes)
     MAX_FILE_SIZES = {
         '.csv': 50 * 1024 * 1024,    # 50MB for CSV files
@@ -61,9 +80,18 @@ class FileValidator:
         r'^\.\\',  # Windows hidden files
         r'[<>:"|?*]',  # Invalid filename characters
         r'^\s+|\s+$',  # Leading/trailing whitespace
-        r'^(CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9])(\.|$)',  # Windows reserved names
     ]
     
+    # Windows reserved device names, the only patterns that need case-insensitive matching
+    RESERVED_NAME_PATTERNS = [
+        r'^(CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9])(\.|$)',
+    ]
+    
+    # Each group of patterns as one compiled alternation, so a filename is scanned once per group
+    # (case-insensitivity is an inline flag, which both re and re2 accept)
+    DANGEROUS_PATTERN_RE = filename_re.compile('|'.join(f'(?:{pattern})' for pattern in DANGEROUS_PATTERNS))
+    RESERVED_NAME_RE = filename_re.compile('(?i)' + '|'.join(f'(?:{pattern})' for pattern in RESERVED_NAME_PATTERNS))
+    
     @staticmethod
     def validate_filename(filename: str) -> str:
         """
@@ -81,13 +109,18 @@ class FileValidator:
         if not filename or not filename.strip():
             raise FileValidationError("Filename cannot be empty", "EMPTY_FILENAME")
         
+        if len(filename) > MAX_FILENAME_LENGTH:
+            raise FileValidationError(
+                f"Filename exceeds {MAX_FILENAME_LENGTH} characters",
+                "FILENAME_TOO_LONG"
+            )
+        
         # Check for dangerous patterns
-        for pattern in FileValidator.DANGEROUS_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
-                raise FileValidationError(
-                    f"Filename contains invalid characters or patterns: {filename}",
-                    "INVALID_FILENAME"
-                )
+        if FileValidator.DANGEROUS_PATTERN_RE.search(filename) or FileValidator.RESERVED_NAME_RE.search(filename):
+            raise FileValidationError(
+                f"Filename contains invalid characters or patterns: {filename}",
+                "INVALID_FILENAME"
+            )
         
         # Sanitize filename using werkzeug's secure_filename
         secure_name = secure_filename(filename)
@@ -113,12 +146,11 @@ class FileValidator:
         Raises:
             UnsupportedFileTypeError: If extension not allowed
         """
-        file_path = Path(filename)
-        extension = file_path.suffix.lower()
+        extension = os.path.splitext(filename)[1].lower()
         
         if extension not in FileValidator.ALLOWED_EXTENSIONS:
-            allowed_exts = list(FileValidator.ALLOWED_EXTENSIONS.keys())
-            raise UnsupportedFileTypeError(filename, allowed_exts)
+            raise UnsupportedFileTypeError(filename, FileValidator.ALLOWED_EXTENSION_NAMES,
+                                           FileValidator.ALLOWED_EXTENSIONS_TEXT)
         
         return extension
     
@@ -141,6 +173,7 @@ class FileValidator:
         mime_type = file_storage.content_type
         
         # Also check with mimetypes module as backup
+        import mimetypes
         guessed_mime, _ = mimetypes.guess_type(file_storage.filename or '')
         
         allowed_mimes = FileValidator.ALLOWED_EXTENSIONS.get(expected_extension, [])
@@ -170,10 +203,15 @@ class FileValidator:
         Raises:
             FileSizeError: If file exceeds size limit
         """
-        # Seek to end to get file size
-        file_storage.seek(0, os.SEEK_END)
-        file_size = file_storage.tell()
-        file_storage.seek(0)  # Reset to beginning
+        # Uploads spooled to disk report their size with a single fstat
+        stream_fd = upload_fileno(file_storage.stream)
+        if stream_fd is not None:
+            file_size = os.fstat(stream_fd).st_size
+        else:
+            # Seek to end to get file size
+            file_storage.seek(0, os.SEEK_END)
+            file_size = file_storage.tell()
+            file_storage.seek(0)  # Reset to beginning
         
         max_size = FileValidator.MAX_FILE_SIZES.get(extension, 50 * 1024 * 1024)  # Default 50MB
         
@@ -241,13 +279,73 @@ def create_secure_filename(file_type: str, original_filename: str) -> str:
     
     # Create timestamp-based hash for uniqueness
     timestamp = str(int(time.time()))
-    name_hash = hashlib.md5(secure_name.encode()).hexdigest()[:8]
-    
-    # Combine type, timestamp, hash, and original name
-    file_path = Path(secure_name)
-    stem = file_path.stem
-    extension = file_path.suffix
+    name_hash = hashlib.blake2b(secure_name.encode(), digest_size=4).hexdigest()  # 8 hex chars
     
-    secure_filename = f"{file_type}_{timestamp}_{name_hash}_{stem}{extension}"
+    # Combine type, timestamp, hash, and original name (stem + extension)
+    secure_filename = f"{file_type}_{timestamp}_{name_hash}_{secure_name}"
     
     return secure_filename
+
+
+def upload_fileno(stream) -> Optional[int]:
+    """Return the OS file descriptor behind an upload stream, or None if it is only in memory"""
+    # SpooledTemporaryFile.fileno() would force an in-memory upload onto disk
+    if not getattr(stream, '_rolled', True):
+        return None
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _open_destination(destination: str):
+    """Open an upload destination for writing, recreating its directory if it is missing"""
+    try:
+        return open(destination, 'wb')
+    except FileNotFoundError:
+        # Upload directories are created at startup but empty-directory cleanup may remove them
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        return open(destination, 'wb')
+
+
+def save_uploaded_file(file_storage: FileStorage, destination: str, hasher=None) -> None:
+    """
+    Stream an uploaded file to disk
+    
+    Uploads Werkzeug has spooled to a real temporary file are copied by the
+    kernel with os.sendfile; small in-memory uploads are copied in 1MB chunks.
+    
+    Args:
+        file_storage: Flask file storage object from request.files
+        destination: Path to write the file to
+        hasher: Optional hashlib object updated with the contents as they are copied
+    """
+    source = file_storage.stream
+    
+    if hasher is not None:
+        # Hash in the same pass as the copy (sendfile never exposes the bytes)
+        with _open_destination(destination) as dst:
+            for chunk in iter(lambda: source.read(UPLOAD_COPY_BUFFER_SIZE), b''):
+                hasher.update(chunk)
+                dst.write(chunk)
+        return
+    
+    source_fd = upload_fileno(source)
+    
+    with _open_destination(destination) as dst:
+        if source_fd is not None and hasattr(os, 'sendfile'):
+            try:
+                offset = source.tell()
+                end = os.fstat(source_fd).st_size
+                while offset < end:
+                    sent = os.sendfile(dst.fileno(), source_fd, offset, end - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError:
+                # sendfile to a regular file is unsupported on this platform
+                dst.seek(0)
+                dst.truncate()
+        
+        shutil.copyfileobj(source, dst, UPLOAD_COPY_BUFFER_SIZE)
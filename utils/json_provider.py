@@ -0,0 +1,33 @@
+"""
+JSON Provider for DBI Operations Hub
+Serializes Flask JSON responses with orjson instead of the stdlib json module.
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's fallback serializer"""
+    
+    # numpy scalars show up in processing results; non-str keys match stdlib behaviour
+    base_options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize data as JSON using orjson"""
+        option = self.base_options
+        
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        
+        # Flask passes indent when pretty-printing responses in debug mode
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON using orjson"""
+        if kwargs:
+            # Hooks like object_hook are only supported by the stdlib decoder
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -6,23 +6,277 @@ import os
 import logging
 import logging.handlers
 import sys
+import copy
+import time
+import queue
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Union
+import orjson
+
+# Records waiting for the background file-writing thread; when full, new records are dropped
+LOG_QUEUE_MAX_SIZE = 10000
+
+# Log file lines collected before they are written out regardless of queue state
+LOG_FILE_BUFFER_SIZE = 64 * 1024  # 64KB
+
+# Lines passed to one writev call (POSIX guarantees an IOV_MAX of at least 16, Linux allows 1024)
+LOG_WRITEV_MAX_LINES = 1024
+
+
+# Structured fields LoggerMixin logs when the caller gives none (only read, never mutated)
+DEFAULT_LOG_EXTRA = {'operation': 'unknown', 'user_id': 'system'}
+
+# Formats tracebacks for records handed to the background writer
+_EXCEPTION_FORMATTER = logging.Formatter()
 
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = None  # ((second, datefmt), formatted time)
+    
     def format(self, record):
-        # Add structured fields
-        if not hasattr(record, 'module'):
-            record.module = record.name
-        if not hasattr(record, 'operation'):
-            record.operation = getattr(record, 'funcName', 'unknown')
-        if not hasattr(record, 'user_id'):
-            record.user_id = getattr(record, 'user_id', 'system')
+        # Add structured fields the caller did not pass in extra
+        # (every LogRecord already has module and funcName)
+        fields = record.__dict__
+        if 'operation' not in fields:
+            fields['operation'] = record.funcName
+        if 'user_id' not in fields:
+            fields['user_id'] = 'system'
         
         return super().format(record)
+    
+    def formatTime(self, record, datefmt=None):
+        """Format the record time, reusing the last result for records in the same second"""
+        if not datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        # One tuple, so threads logging at once never see a mismatched second and text
+        cached = self._time_cache
+        if cached is None or cached[0] != (second, datefmt):
+            cached = ((second, datefmt), time.strftime(datefmt, self.converter(second)))
+            self._time_cache = cached
+        return cached[1]
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one compact JSON object per line for the log files"""
+    
+    def format(self, record):
+        fields = record.__dict__
+        entry = {
+            'timestamp': record.created,
+            'level': record.levelname,
+            'module': record.module,
+            'operation': fields.get('operation', record.funcName),
+            'user_id': fields.get('user_id', 'system'),
+            'message': record.getMessage(),
+        }
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        
+        return orjson.dumps(entry, default=str).decode()
+
+
+# Shared by every setup_logging call: JSON Lines for the log files, plain text for the console
+FILE_FORMATTER = JsonFormatter()
+CONSOLE_FORMATTER = StructuredFormatter(
+    fmt='%(asctime)s | %(levelname)-8s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that collects records and writes them to the file together
+    
+    Records are encoded once and kept as bytes until a flush, which appends them
+    to an unbuffered O_APPEND file with a single write. Only whole lines are
+    written, so lines from Gunicorn workers sharing a log file never interleave
+    mid-line. Records are not flushed one at a time: the background listener
+    flushes once it has caught up with the queue (or LOG_FILE_BUFFER_SIZE is
+    pending), and ERROR records are flushed straight away. The file size is
+    tracked in memory rather than checked on the stream for every record.
+    
+    Records at or above copy_to's level are also appended to copy_to (e.g. an
+    errors-only file) as the same encoded line, so they are formatted only once.
+    """
+    
+    def __init__(self, filename, *args, copy_to: Optional['BufferedRotatingFileHandler'] = None, **kwargs):
+        self._pending = []  # Encoded lines not yet written
+        self._pending_size = 0
+        super().__init__(filename, *args, **kwargs)
+        self.copy_to = copy_to
+    
+    def _open(self):
+        # Log files are UTF-8 unless an encoding was given explicitly
+        self._encoding = self.encoding if self.encoding not in (None, 'locale') else 'utf-8'
+        self._terminator = self.terminator.encode(self._encoding)
+        stream = open(self.baseFilename, self.mode + 'b', buffering=0)
+        self._file_size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def _is_regular_file(self) -> bool:
+        """Whether the log path can be rolled over (not e.g. /dev/null); only checked once a rollover is due"""
+        return not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+    
+    def flush(self):
+        """Write all pending lines to the file"""
+        self.acquire()
+        try:
+            if self._pending and self.stream is not None:
+                lines = self._pending
+                self._pending = []
+                self._pending_size = 0
+                if hasattr(os, 'writev'):
+                    self._write_lines(lines)
+                else:
+                    self._write_all(b''.join(lines))
+        finally:
+            self.release()
+    
+    def _write_lines(self, lines):
+        """Hand the lines to the kernel as-is with writev, without joining them first"""
+        fd = self.stream.fileno()
+        for start in range(0, len(lines), LOG_WRITEV_MAX_LINES):
+            chunk = lines[start:start + LOG_WRITEV_MAX_LINES]
+            written = os.writev(fd, chunk)
+            if written < sum(map(len, chunk)):
+                # Short write: finish the rest of this chunk with plain writes
+                self._write_all(memoryview(b''.join(chunk))[written:])
+    
+    def _write_all(self, data):
+        """Write data to the file, retrying after short writes"""
+        data = memoryview(data)
+        while data:
+            data = data[self.stream.write(data):]
+    
+    def doRollover(self):
+        # Pending lines belong to the file being rotated out
+        self.flush()
+        super().doRollover()
+        # With delay=True the base class leaves the new file unopened; open it now so the
+        # line that triggered the rollover (and any flush) has a stream to go to
+        if self.stream is None:
+            self.stream = self._open()
+    
+    def write_line(self, line: bytes, flush: bool = False):
+        """Queue an encoded line for the file, rolling the file over first if it would exceed maxBytes"""
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0 and self._file_size + len(line) >= self.maxBytes and self._is_regular_file():
+            self.doRollover()
+        self._pending.append(line)
+        self._pending_size += len(line)
+        self._file_size += len(line)
+        if flush or self._pending_size >= LOG_FILE_BUFFER_SIZE:
+            self.flush()
+    
+    def emit(self, record):
+        """Write a record to the file (and its copy file), flushing ERROR records straight away"""
+        try:
+            if self.stream is None:  # Opened on first use when created with delay=True
+                self.stream = self._open()
+            line = self.format(record).encode(self._encoding, self.errors or 'strict') + self._terminator
+            is_error = record.levelno >= logging.ERROR
+            self.write_line(line, flush=is_error)
+            
+            copy_to = self.copy_to
+            if copy_to is not None and record.levelno >= copy_to.level:
+                copy_to.acquire()
+                try:
+                    copy_to.write_line(line, flush=is_error)
+                finally:
+                    copy_to.release()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever it has caught up with the queue"""
+    
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a QueueListener thread that formats and writes them to the target handlers
+    
+    The listener is started on the first record, and again in a forked worker
+    (e.g. Gunicorn with --preload), where the parent's thread does not exist.
+    """
+    
+    def __init__(self, *handlers: logging.Handler, maxsize: int = LOG_QUEUE_MAX_SIZE):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.target_handlers = handlers
+        self.maxsize = maxsize
+        self.dropped_records = 0
+        self._listener = None
+        self._listener_pid = None
+    
+    def _ensure_listener(self):
+        """Start the listener thread if this process has none (called under the handler lock)"""
+        if self._listener_pid == os.getpid():
+            return
+        # A queue inherited across fork may hold locks taken by threads that no longer exist
+        self.queue = queue.Queue(maxsize=self.maxsize)
+        self._listener = FlushingQueueListener(self.queue, *self.target_handlers,
+                                               respect_handler_level=True)
+        self._listener.start()
+        self._listener_pid = os.getpid()
+    
+    def enqueue(self, record):
+        """Queue a record without blocking the caller, dropping it if the queue is full"""
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+    
+    def prepare(self, record):
+        """
+        Resolve the message and traceback text before the record crosses threads
+        
+        Unlike the base implementation, the traceback stays in exc_text instead of
+        being folded into the message, so the file formatter can report it separately.
+        """
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def close(self):
+        """Write out queued records and stop the listener (run by logging.shutdown at exit)"""
+        self.acquire()
+        try:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+                for handler in self.target_handlers:
+                    handler.flush()
+            self._listener = None
+            self._listener_pid = None
+        finally:
+            self.release()
+        super().close()
 
 
 def setup_logging(app_name: str = "dbi_operations_hub", log_level: str = None) -> logging.Logger:
@@ -40,53 +294,48 @@ def setup_logging(app_name: str = "dbi_operations_hub", log_level: str = None) -
     if log_level is None:
         log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
     
-    # Create logs directory
-    log_dir = Path('logs')
-    log_dir.mkdir(exist_ok=True)
-    
     # Configure root logger
     logger = logging.getLogger(app_name)
     logger.setLevel(getattr(logging, log_level))
     
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Already set up in this process (e.g. the app was created again): keep the running
+    # handlers rather than adding another set that would write every record twice
+    if logger.handlers:
+        return logger
     
-    # Create formatters
-    detailed_formatter = StructuredFormatter(
-        fmt='%(asctime)s | %(levelname)-8s | %(module)s.%(operation)s | %(user_id)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    simple_formatter = StructuredFormatter(
-        fmt='%(asctime)s | %(levelname)-8s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # Create logs directory
+    log_dir = Path('logs')
+    log_dir.mkdir(exist_ok=True)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(simple_formatter)
+    console_handler.setFormatter(CONSOLE_FORMATTER)
     logger.addHandler(console_handler)
     
-    # File handler for all logs
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_dir / f'{app_name}.log',
+    # Error file, written with the lines the main file handler has already formatted
+    error_handler = BufferedRotatingFileHandler(
+        log_dir / f'{app_name}_errors.log',
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Not opened (or created) until the first record
     )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(detailed_formatter)
-    logger.addHandler(file_handler)
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(FILE_FORMATTER)
     
-    # Error file handler
-    error_handler = logging.handlers.RotatingFileHandler(
-        log_dir / f'{app_name}_errors.log',
+    # File handler for all logs, copying ERROR lines to the error file
+    file_handler = BufferedRotatingFileHandler(
+        log_dir / f'{app_name}.log',
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True,
+        copy_to=error_handler
     )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(detailed_formatter)
-    logger.addHandler(error_handler)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(FILE_FORMATTER)
+    
+    # File handlers run on a background thread so formatting and disk IO stay off the request path
+    logger.addHandler(BackgroundQueueHandler(file_handler))
     
     return logger
 
@@ -101,29 +350,57 @@ class LoggerMixin:
     
     @property
     def logger(self) -> logging.Logger:
-        """Get logger for the class"""
-        class_name = self.__class__.__name__
-        module_name = self.__class__.__module__.split('.')[-1]
-        return get_logger(f"{module_name}.{class_name}")
+        """Get logger for the class (looked up once per class)"""
+        return _class_logger(self.__class__)
     
-    def log_operation(self, message: str, level: int = logging.INFO, 
+    def log_operation(self, message: Union[str, Callable[[], str]], level: int = logging.INFO, 
                      operation: str = None, user_id: str = None, **kwargs):
-        """Log an operation with structured data"""
-        extra = {
-            'operation': operation or 'unknown',
-            'user_id': user_id or 'system'
-        }
-        extra.update(kwargs)
+        """
+        Log an operation with structured data
+        
+        message may be a zero-argument callable (e.g. lambda: f"..."), which is
+        only called when the level is enabled.
+        """
+        logger = self.logger
+        if not logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        
+        if not (operation or user_id or kwargs):
+            extra = DEFAULT_LOG_EXTRA
+        else:
+            extra = {
+                'operation': operation or 'unknown',
+                'user_id': user_id or 'system',
+                **kwargs
+            }
         
-        self.logger.log(level, message, extra=extra)
+        logger.log(level, message, extra=extra)
     
-    def log_error(self, message: str, exc_info=True, operation: str = None, 
+    def log_error(self, message: Union[str, Callable[[], str]], exc_info=True, operation: str = None, 
                   user_id: str = None, **kwargs):
-        """Log an error with full context"""
-        extra = {
-            'operation': operation or 'unknown', 
-            'user_id': user_id or 'system'
-        }
-        extra.update(kwargs)
+        """Log an error with full context (message may be a callable, as for log_operation)"""
+        logger = self.logger
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+        if callable(message):
+            message = message()
+        
+        if not (operation or user_id or kwargs):
+            extra = DEFAULT_LOG_EXTRA
+        else:
+            extra = {
+                'operation': operation or 'unknown', 
+                'user_id': user_id or 'system',
+                **kwargs
+            }
         
-        self.logger.error(message, exc_info=exc_info, extra=extra)
+        logger.error(message, exc_info=exc_info, extra=extra)
+
+
+@functools.cache
+def _class_logger(cls) -> logging.Logger:
+    """Logger named after a LoggerMixin subclass's module and class"""
+    module_name = cls.__module__.split('.')[-1]
+    return get_logger(f"{module_name}.{cls.__name__}")
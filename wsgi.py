@@ -4,17 +4,20 @@ Provides proper WSGI interface for production deployment with Gunicorn
 """
 import os
 
+# Config is chosen from the environment the server process was started with
+CONFIG_NAME = os.environ.get('FLASK_ENV', 'production')
+
 
 def create_wsgi_app():
     """Create the Flask application instance for WSGI"""
     from app import create_app
     
-    # Determine config based on environment
-    config_name = os.environ.get('FLASK_ENV', 'production')
-    return create_app(config_name)
+    return create_app(CONFIG_NAME)
 
 
-# Create the Flask application instance for Gunicorn
+# Create the Flask application instance for Gunicorn. The Dockerfile runs Gunicorn
+# with --preload, so this (including environment validation) happens once in the
+# master process and forked workers inherit the result.
 app = create_wsgi_app()
 
 if __name__ == "__main__":